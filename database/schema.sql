@@ -26,6 +26,8 @@ CREATE INDEX IF NOT EXISTS idx_attempts_category ON attempts(category);
 CREATE INDEX IF NOT EXISTS idx_attempts_timestamp ON attempts(timestamp);
 CREATE INDEX IF NOT EXISTS idx_attempts_difficulty ON attempts(difficulty);
 CREATE INDEX IF NOT EXISTS idx_attempts_scenario_id ON attempts(scenario_id);
+-- Covers the per-category/difficulty aggregation in get_statistics()
+CREATE INDEX IF NOT EXISTS idx_attempts_cat_diff ON attempts(category, difficulty, passed, score);
 
 -- Table for learning progress
 CREATE TABLE IF NOT EXISTS learning_progress (
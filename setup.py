@@ -33,11 +33,13 @@ setup(
             "pytest>=7.0.0",
             "hypothesis>=6.0.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.0.0",
         ],
         "dev": [
             "pytest>=7.0.0",
             "hypothesis>=6.0.0",
             "pytest-cov>=4.1.0",
+            "pytest-xdist>=3.0.0",
             "black>=23.0.0",
             "flake8>=6.0.0",
             "mypy>=1.0.0",
@@ -395,7 +395,7 @@ class Engine:
             print(f"{Colors.CYAN}{'=' * 70}{Colors.RESET}\n")
             
             # Run docker exec interactively
-            subprocess.run(shell_cmd, shell=True)
+            subprocess.run(shell_cmd)
             
             print(f"\n{Colors.CYAN}{'=' * 70}{Colors.RESET}")
             print(f"{success('✓')} Shell closed. Starting validation...")
@@ -405,7 +405,7 @@ class Engine:
             logger.error(f"Failed to open shell: {e}")
             print(f"\n{warning('⚠')} Could not open shell automatically.")
             print(f"{dim('You can manually access the container with:')}")
-            print(f"  {shell_cmd}\n")
+            print(f"  {self.docker_manager.get_container_shell_str(self.current_container)}\n")
             print(f"{dim('Press Enter when ready for validation...')}")
             input()
     
@@ -7,6 +7,13 @@ from typing import List, Optional, Union, Dict, Any
 from enum import Enum
 
 
+# Allowed scenario field values, in the order error messages list them
+VALID_CATEGORIES = ('networking', 'storage', 'users_groups',
+                    'operations_deployment', 'essential_commands')
+VALID_DIFFICULTIES = ('easy', 'medium', 'hard')
+VALID_DISTRIBUTIONS = ('ubuntu', 'centos', 'rocky')
+
+
 class CheckType(Enum):
     """Types of validation checks"""
     COMMAND = "command"
@@ -258,15 +265,12 @@ class Scenario:
             errors.append("id must be a non-empty string")
         
         # Validate category
-        valid_categories = ['networking', 'storage', 'users_groups', 
-                          'operations_deployment', 'essential_commands']
-        if self.category not in valid_categories:
-            errors.append(f"category must be one of: {', '.join(valid_categories)}")
+        if self.category not in VALID_CATEGORIES:
+            errors.append(f"category must be one of: {', '.join(VALID_CATEGORIES)}")
         
         # Validate difficulty
-        valid_difficulties = ['easy', 'medium', 'hard']
-        if self.difficulty not in valid_difficulties:
-            errors.append(f"difficulty must be one of: {', '.join(valid_difficulties)}")
+        if self.difficulty not in VALID_DIFFICULTIES:
+            errors.append(f"difficulty must be one of: {', '.join(VALID_DIFFICULTIES)}")
         
         # Validate task description
         if not self.task or not isinstance(self.task, str):
@@ -278,9 +282,8 @@ class Scenario:
         
         # Validate distribution if specified
         if self.distribution:
-            valid_distributions = ['ubuntu', 'centos', 'rocky']
-            if self.distribution not in valid_distributions:
-                errors.append(f"distribution must be one of: {', '.join(valid_distributions)}")
+            if self.distribution not in VALID_DISTRIBUTIONS:
+                errors.append(f"distribution must be one of: {', '.join(VALID_DISTRIBUTIONS)}")
         
         # Validate validation rules
         if not self.validation.checks:
@@ -2,11 +2,15 @@
 Scenario Loader - Loads and manages scenarios from YAML files
 """
 
+import copy
+import functools
+import json
 import os
+import re
 import yaml
 import random
 import logging
-from typing import List, Dict, Optional
+from typing import Any, Callable, IO, Iterable, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 
 from .models import Scenario, ValidationRules
@@ -17,16 +21,56 @@ from jinja2 import Template
 
 logger = logging.getLogger(__name__)
 
+# libyaml's C parser when PyYAML was built with it, the pure-Python one otherwise
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Scenario files are YAML; JSON is accepted too, and parsed with the json module
+_SCENARIO_SUFFIXES = ('.yaml', '.yml', '.json')
+
+# Jinja statement, expression and comment delimiters
+_TEMPLATE_MARKUP = re.compile(r'\{[{%#]')
+
+
+def _scan_tree(top: str) -> Iterator[Tuple[str, List[str], List[str]]]:
+    """
+    Walk a directory tree like os.walk(), straight on top of os.scandir()
+    
+    Entries are sorted into directories and files using the type readdir
+    already reported, and symlinked directories aren't descended into.
+    Unreadable directories are skipped, as os.walk() does by default.
+    """
+    dirs, files = [], []
+    try:
+        with os.scandir(top) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+    except OSError:
+        return
+    
+    yield top, dirs, files
+    for name in dirs:
+        yield from _scan_tree(os.path.join(top, name))
+
 
 class ScenarioLoader:
     """
     Loads, parses, and manages scenario definitions from YAML files
     """
     
-    def __init__(self, scenarios_path: str = "scenarios"):
+    def __init__(self, scenarios_path: str = "scenarios",
+                 opener: Callable[..., IO] = open,
+                 walker: Callable[[str], Iterable[Tuple[str, List[str], List[str]]]] = _scan_tree):
         self.scenarios_path = scenarios_path
+        # Stand-ins for open() and the directory walk, e.g. to load an in-memory tree
+        self._opener = opener
+        self._walker = walker
         self._scenarios: Dict[str, List[Scenario]] = {}
         self._scenarios_by_id: Dict[str, Scenario] = {}
+        # Scenarios per (category, difficulty), so combined filters need no scan
+        self._scenarios_by_level: Dict[Tuple[str, str], List[Scenario]] = {}
         self._loaded = False
         self.error_handler = ErrorHandler()
         self.context_generator = ContextGenerator()
@@ -43,14 +87,17 @@ class ScenarioLoader:
         
         self._scenarios = {}
         self._scenarios_by_id = {}
+        self._scenarios_by_level = {}
         
-        if not os.path.exists(self.scenarios_path):
+        # The default walker yields nothing for a missing directory, so check for it
+        # up front; a custom walker is trusted to describe its own tree
+        if self._walker is _scan_tree and not os.path.exists(self.scenarios_path):
             raise FileNotFoundError(f"Scenarios directory not found: {self.scenarios_path}")
         
         # Walk through scenarios directory
-        for root, dirs, files in os.walk(self.scenarios_path):
+        for root, dirs, files in self._walker(self.scenarios_path):
             for file in files:
-                if file.endswith('.yaml') or file.endswith('.yml'):
+                if file.endswith(_SCENARIO_SUFFIXES):
                     file_path = os.path.join(root, file)
                     try:
                         scenarios = self._load_file(file_path)
@@ -59,6 +106,9 @@ class ScenarioLoader:
                             if scenario.category not in self._scenarios:
                                 self._scenarios[scenario.category] = []
                             self._scenarios[scenario.category].append(scenario)
+                            self._scenarios_by_level.setdefault(
+                                (scenario.category, scenario.difficulty), []
+                            ).append(scenario)
                             
                             # Add to ID lookup
                             if scenario.id in self._scenarios_by_id:
@@ -82,24 +132,72 @@ class ScenarioLoader:
     
     def _load_file(self, file_path: str) -> List[Scenario]:
         """
-        Load scenarios from a single YAML file
+        Load scenarios from a single YAML or JSON file
         
         Args:
-            file_path: Path to YAML file
+            file_path: Path to YAML or JSON file
         
         Returns:
             List of Scenario objects
         """
-        with open(file_path, 'r') as f:
+        with self._opener(file_path, 'r') as f:
             content = f.read()
+        
+        # Without template markup a file renders the same on every load, so its
+        # decoded document can be reused; each load still builds its own Scenarios
+        if not _TEMPLATE_MARKUP.search(content):
+            data = copy.deepcopy(_decode_static_content(content, file_path))
+            return self._parse_data(data, file_path)
             
         # Generate context and render template
         context = self.context_generator.generate()
         template = Template(content)
         rendered_content = template.render(**context)
         
-        data = yaml.safe_load(rendered_content)
+        return self._parse_content(rendered_content, file_path)
+    
+    @staticmethod
+    def _parse_content(content: str, file_path: str) -> List[Scenario]:
+        """
+        Parse scenarios from rendered YAML or JSON text
+        
+        Args:
+            content: Rendered file contents
+            file_path: Path to source file (selects the parser, and for error messages)
+        
+        Returns:
+            List of Scenario objects
+        """
+        return ScenarioLoader._parse_data(ScenarioLoader._decode_content(content, file_path), file_path)
+    
+    @staticmethod
+    def _decode_content(content: str, file_path: str) -> Any:
+        """
+        Decode rendered YAML or JSON text
+        
+        Args:
+            content: Rendered file contents
+            file_path: Path to source file (selects the parser)
+        
+        Returns:
+            The decoded document
+        """
+        if file_path.endswith('.json'):
+            return json.loads(content)
+        return yaml.load(content, Loader=_YAML_LOADER)
+    
+    @staticmethod
+    def _parse_data(data: Any, file_path: str) -> List[Scenario]:
+        """
+        Parse scenarios from a decoded YAML or JSON document
         
+        Args:
+            data: Decoded document (one scenario dict or a list of them)
+            file_path: Path to source file (for error messages)
+        
+        Returns:
+            List of Scenario objects
+        """
         if not data:
             return []
         
@@ -108,13 +206,13 @@ class ScenarioLoader:
         # Handle both single scenario and list of scenarios
         if isinstance(data, dict):
             # Single scenario
-            scenario = self._parse_scenario(data, file_path)
+            scenario = ScenarioLoader._parse_scenario(data, file_path)
             if scenario:
                 scenarios.append(scenario)
         elif isinstance(data, list):
             # Multiple scenarios
             for item in data:
-                scenario = self._parse_scenario(item, file_path)
+                scenario = ScenarioLoader._parse_scenario(item, file_path)
                 if scenario:
                     scenarios.append(scenario)
         else:
@@ -122,7 +220,8 @@ class ScenarioLoader:
         
         return scenarios
     
-    def _parse_scenario(self, data: Dict, file_path: str) -> Optional[Scenario]:
+    @staticmethod
+    def _parse_scenario(data: Dict, file_path: str) -> Optional[Scenario]:
         """
         Parse a scenario from dictionary data
         
@@ -168,17 +267,7 @@ class ScenarioLoader:
         if not self._loaded:
             self.load_all()
         
-        # Get all scenarios
-        all_scenarios = []
-        if category:
-            all_scenarios = self._scenarios.get(category, [])
-        else:
-            for scenarios in self._scenarios.values():
-                all_scenarios.extend(scenarios)
-        
-        # Filter by difficulty
-        if difficulty:
-            all_scenarios = [s for s in all_scenarios if s.difficulty == difficulty]
+        all_scenarios = self._matching(category, difficulty)
         
         # Filter by distribution (None means compatible with all)
         if distribution:
@@ -193,6 +282,23 @@ class ScenarioLoader:
         
         return None
     
+    def _matching(self, category: Optional[str],
+                  difficulty: Optional[str]) -> List[Scenario]:
+        """
+        Scenarios matching the category and difficulty filters, from the indexes
+        
+        Results are in load order within each category, in a new list the
+        caller may modify.
+        """
+        if category and difficulty:
+            return list(self._scenarios_by_level.get((category, difficulty), []))
+        if category:
+            return list(self._scenarios.get(category, []))
+        if difficulty:
+            return [s for cat in self._scenarios
+                    for s in self._scenarios_by_level.get((cat, difficulty), [])]
+        return [s for scenarios in self._scenarios.values() for s in scenarios]
+    
     def get_by_id(self, scenario_id: str) -> Optional[Scenario]:
         """
         Get a specific scenario by ID
@@ -225,19 +331,7 @@ class ScenarioLoader:
         if not self._loaded:
             self.load_all()
         
-        # Get scenarios
-        if category:
-            scenarios = self._scenarios.get(category, [])
-        else:
-            scenarios = []
-            for cat_scenarios in self._scenarios.values():
-                scenarios.extend(cat_scenarios)
-        
-        # Filter by difficulty
-        if difficulty:
-            scenarios = [s for s in scenarios if s.difficulty == difficulty]
-        
-        return scenarios
+        return self._matching(category, difficulty)
     
     def get_categories(self) -> List[str]:
         """
@@ -282,8 +376,8 @@ class ScenarioLoader:
         errors = []
         
         try:
-            with open(file_path, 'r') as f:
-                data = yaml.safe_load(f)
+            with self._opener(file_path, 'r') as f:
+                data = yaml.load(f, Loader=_YAML_LOADER)
             
             if not data:
                 errors.append("File is empty")
@@ -308,3 +402,14 @@ class ScenarioLoader:
             errors.append(f"Error: {e}")
         
         return errors
+
+
+@functools.lru_cache(maxsize=1024)
+def _decode_static_content(content: str, file_path: str) -> Any:
+    """
+    Decode a scenario file that has no template markup, memoized on its contents
+    
+    The cached document is shared, so callers deep-copy it before use.
+    Decode errors propagate and aren't cached.
+    """
+    return ScenarioLoader._decode_content(content, file_path)
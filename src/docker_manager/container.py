@@ -5,11 +5,14 @@ Handles container lifecycle for isolated practice environments
 
 import docker
 from docker.errors import DockerException, ImageNotFound, APIError, NotFound
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Set, Tuple, Any
 import logging
 import os
+import re
+import shlex
 import tarfile
 import io
+import uuid
 from dataclasses import dataclass
 
 from ..utils.config import DockerConfig
@@ -40,12 +43,13 @@ class DockerManager:
     - Handle Docker daemon errors
     """
     
-    def __init__(self, config: DockerConfig):
+    def __init__(self, config: DockerConfig, client: Optional[docker.DockerClient] = None):
         """
         Initialize Docker Manager
         
         Args:
             config: Docker configuration
+            client: Existing Docker client to reuse (a new one is created if omitted)
             
         Raises:
             DockerException: If Docker daemon is not available
@@ -55,7 +59,7 @@ class DockerManager:
         
         # Check if Docker daemon is available
         try:
-            self.client = docker.from_env()
+            self.client = client if client is not None else docker.from_env()
             self.client.ping()
             logger.info("Docker daemon connection established")
         except DockerException as e:
@@ -73,6 +77,10 @@ class DockerManager:
                 "Please install Docker and ensure the daemon is running. "
                 "Visit https://docs.docker.com/get-docker/ for installation instructions."
             ) from e
+        
+        # Tags already confirmed (or built) by _ensure_image, so later
+        # create_container() calls skip the per-call inspect round-trip for them
+        self._known_images: Set[str] = set()
     
     def create_container(self, distribution: str, scenario: Scenario) -> docker.models.containers.Container:
         """
@@ -92,40 +100,13 @@ class DockerManager:
         # Determine image to use
         image_name = self._get_image_name(distribution)
         
-        # Ensure image is available
-        try:
-            self.client.images.get(image_name)
+        # Ensure image is available; images already known locally skip the daemon lookup
+        from_known_images = image_name in self._known_images
+        if from_known_images:
             logger.info(f"Using existing image: {image_name}")
-        except ImageNotFound as e:
-            logger.warning(f"Image {image_name} not found, building automatically...")
-            
-            # Import image builder
-            from .image_builder import DockerImageBuilder
-            
-            # Build the image automatically
-            builder = DockerImageBuilder(self.client)
-            
-            print(f"\n⚠️  Docker image '{image_name}' not found.")
-            print("Building it automatically (this is a one-time setup)...\n")
-            
-            success = builder.build_image(distribution, show_progress=True)
-            
-            if not success:
-                # Use error handler for better error reporting
-                context = ErrorContext(
-                    scenario_id=scenario.id,
-                    user_action="create_container",
-                    category=scenario.category,
-                    difficulty=scenario.difficulty,
-                    additional_info={'image_name': image_name, 'distribution': distribution}
-                )
-                response = handle_docker_error(e, context, self.error_handler)
-                print(self.error_handler.format_error_for_user(response))
-                
-                raise ImageNotFound(
-                    f"Failed to build image '{image_name}'. "
-                    f"Please check Docker daemon and try again."
-                ) from e
+        else:
+            self._ensure_image(image_name, distribution, scenario)
+            self._known_images.add(image_name)
         
         # Create container configuration
         container_config = {
@@ -136,7 +117,9 @@ class DockerManager:
             'network_mode': self.config.network_mode,
             'privileged': self.config.privileged,
             'remove': False,  # We'll remove manually for cleanup control
-            'name': f"lfcs-practice-{scenario.id}-{os.getpid()}",
+            # Unique even when one process (e.g. a pytest-xdist worker) keeps several
+            # containers for the same scenario alive at once
+            'name': f"lfcs-practice-{scenario.id}-{os.getpid()}-{uuid.uuid4().hex[:6]}",
             # Required for systemd to work in containers
             'volumes': {
                 '/sys/fs/cgroup': {'bind': '/sys/fs/cgroup', 'mode': 'ro'},
@@ -144,13 +127,25 @@ class DockerManager:
                 **({self.config.control_dir: {'bind': '/opt/lfcs/control', 'mode': 'rw'}} 
                    if hasattr(self.config, 'control_dir') and self.config.control_dir else {})
             },
-            'tmpfs': {'/run': '', '/run/lock': ''},
-            'cap_add': ['SYS_ADMIN'],
+            'tmpfs': {'/run': '', '/run/lock': '', **self.config.tmpfs_mounts},
+            'cap_add': list(self.config.cap_add),
+            'cap_drop': list(self.config.cap_drop),
         }
         
         try:
             # Create and start container
-            container = self.client.containers.run(**container_config)
+            try:
+                container = self.client.containers.run(**container_config)
+            except ImageNotFound:
+                if not from_known_images:
+                    raise
+                # Removed since it was confirmed (e.g. docker rmi); forget it and
+                # go through the normal check-or-build path once
+                logger.warning(f"Image {image_name} is no longer present locally")
+                self._known_images.discard(image_name)
+                self._ensure_image(image_name, distribution, scenario)
+                self._known_images.add(image_name)
+                container = self.client.containers.run(**container_config)
             logger.info(f"Created container {container.short_id} for scenario {scenario.id}")
             
             # Run setup commands if specified
@@ -200,25 +195,18 @@ class DockerManager:
             APIError: If command execution fails
         """
         try:
-            # Refresh container state
-            container.reload()
-            
-            # Check if container is running
-            if container.status != 'running':
-                raise APIError(f"Container {container.short_id} is not running (status: {container.status})")
+            # Talk to the low-level API on the shared client's keep-alive connection
+            # pool. No container.reload() first: the daemon already rejects execs in
+            # a container that is not running (409), which is reported below.
+            api = self.client.api
             
             # Execute command
             logger.debug(f"Executing command in {container.short_id}: {command}")
-            exec_result = container.exec_run(
-                command,
-                demux=True,  # Separate stdout and stderr
-                tty=False,
-            )
-            
-            exit_code = exec_result.exit_code
+            exec_id = api.exec_create(container.id, command, stdout=True, stderr=True, tty=False)['Id']
             
             # Handle demuxed output (stdout, stderr)
-            stdout, stderr = exec_result.output
+            stdout, stderr = api.exec_start(exec_id, tty=False, demux=True)
+            exit_code = api.exec_inspect(exec_id)['ExitCode']
             
             output = ""
             error = None
@@ -250,6 +238,58 @@ class DockerManager:
             
             raise APIError(f"Failed to execute command in container: {e}") from e
     
+    def execute_batch(self, container: docker.models.containers.Container,
+                      commands: List[str]) -> List[ExecutionResult]:
+        """
+        Execute several commands with a single exec call
+        
+        Each command runs in its own subshell, so a failing command (or one that
+        calls exit or cd) does not affect the others. Output is split back into
+        one result per command using a random marker.
+        
+        Args:
+            container: Docker container object
+            commands: Shell commands to execute, in order
+        
+        Returns:
+            One ExecutionResult per command, in the same order
+        
+        Raises:
+            APIError: If command execution fails
+        """
+        if not commands:
+            return []
+        
+        marker = f"__lfcs_batch_{uuid.uuid4().hex}__"
+        script = "".join(
+            f"printf '{marker}:%d\\n' {i}; printf '{marker}:%d\\n' {i} >&2; "
+            f"(\n{cmd}\n); printf '{marker}:rc:%d\\n' $?; "
+            for i, cmd in enumerate(commands)
+        )
+        result = self.execute_command(container, f"sh -c {shlex.quote(script)}")
+        
+        stdout_parts = re.findall(rf"{marker}:(\d+)\n(.*?){marker}:rc:(\d+)\n",
+                                  result.output, re.DOTALL)
+        outputs = {int(index): (output, int(exit_code)) for index, output, exit_code in stdout_parts}
+        stderr_parts = re.split(rf"{marker}:(\d+)\n", result.error or "")
+        errors = dict(zip(map(int, stderr_parts[1::2]), stderr_parts[2::2]))
+        
+        results = []
+        for index in range(len(commands)):
+            if index not in outputs:
+                # The batch shell died before reaching this command
+                results.append(ExecutionResult(exit_code=-1, output="",
+                                               error="Command was not run"))
+                continue
+            output, exit_code = outputs[index]
+            results.append(ExecutionResult(
+                exit_code=exit_code,
+                output=output,
+                error=errors.get(index) or None
+            ))
+        
+        return results
+    
     def copy_to_container(self, container: docker.models.containers.Container, 
                          src: str, dest: str) -> None:
         """
@@ -283,6 +323,34 @@ class DockerManager:
             logger.error(f"Failed to copy file to container: {e}")
             raise APIError(f"Failed to copy file to container: {e}") from e
     
+    def copy_bytes_to_container(self, container: docker.models.containers.Container,
+                                dest: str, filename: str, data: bytes) -> None:
+        """
+        Write in-memory data to a file in the container, without a host file
+        
+        Args:
+            container: Docker container object
+            dest: Destination directory in container
+            filename: Name of the file to create in dest
+            data: File contents
+            
+        Raises:
+            APIError: If copy operation fails
+        """
+        try:
+            tar_stream = io.BytesIO()
+            with tarfile.open(fileobj=tar_stream, mode='w') as tar:
+                info = tarfile.TarInfo(filename)
+                info.size = len(data)
+                tar.addfile(info, io.BytesIO(data))
+            
+            container.put_archive(dest, tar_stream.getvalue())
+            logger.info(f"Copied {len(data)} bytes to {container.short_id}:{dest}/{filename}")
+            
+        except Exception as e:
+            logger.error(f"Failed to copy data to container: {e}")
+            raise APIError(f"Failed to copy data to container: {e}") from e
+    
     def destroy_container(self, container: docker.models.containers.Container) -> None:
         """
         Stop and remove a container, cleaning up all resources
@@ -323,17 +391,75 @@ class DockerManager:
         except Exception as e:
             logger.error(f"Error during container cleanup: {e}")
     
-    def get_container_shell(self, container: docker.models.containers.Container) -> str:
+    def get_container_shell(self, container: docker.models.containers.Container) -> List[str]:
         """
         Get the command to attach to container shell
         
+        Args:
+            container: Docker container object
+            
+        Returns:
+            Shell command as an argument list, ready for subprocess.run()
+        """
+        return ["docker", "exec", "-it", container.name, "/bin/bash"]
+    
+    def get_container_shell_str(self, container: docker.models.containers.Container) -> str:
+        """
+        Get the command to attach to container shell, for display
+        
         Args:
             container: Docker container object
             
         Returns:
             Shell command string
         """
-        return f"docker exec -it {container.name} /bin/bash"
+        return " ".join(self.get_container_shell(container))
+    
+    def _ensure_image(self, image_name: str, distribution: str, scenario: Scenario) -> None:
+        """
+        Make sure an image exists locally, building it if it doesn't
+        
+        Args:
+            image_name: Full image name
+            distribution: Linux distribution the image is for
+            scenario: Scenario the image is needed for (for error reporting)
+            
+        Raises:
+            ImageNotFound: If the image is missing and can't be built
+        """
+        try:
+            self.client.images.get(image_name)
+            logger.info(f"Using existing image: {image_name}")
+        except ImageNotFound as e:
+            logger.warning(f"Image {image_name} not found, building automatically...")
+            
+            # Import image builder
+            from .image_builder import DockerImageBuilder
+            
+            # Build the image automatically
+            builder = DockerImageBuilder(self.client)
+            
+            print(f"\n⚠️  Docker image '{image_name}' not found.")
+            print("Building it automatically (this is a one-time setup)...\n")
+            
+            success = builder.build_image(distribution, show_progress=True)
+            
+            if not success:
+                # Use error handler for better error reporting
+                context = ErrorContext(
+                    scenario_id=scenario.id,
+                    user_action="create_container",
+                    category=scenario.category,
+                    difficulty=scenario.difficulty,
+                    additional_info={'image_name': image_name, 'distribution': distribution}
+                )
+                response = handle_docker_error(e, context, self.error_handler)
+                print(self.error_handler.format_error_for_user(response))
+                
+                raise ImageNotFound(
+                    f"Failed to build image '{image_name}'. "
+                    f"Please check Docker daemon and try again."
+                ) from e
     
     def _get_image_name(self, distribution: str) -> str:
         """
@@ -4,13 +4,59 @@ Handles loading configuration from YAML files and environment variables
 """
 
 import os
+import sys
 import yaml
 from dataclasses import dataclass, field
 from typing import Optional, Dict, List, Any
 from pathlib import Path
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; fall back to regular dataclasses on 3.9
+_DATACLASS_OPTIONS: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+VALID_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+
+PASSING_THRESHOLD_ERROR = "Passing threshold must be between 0.0 and 1.0, got {}"
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment variable value"""
+    return value.lower() in ('true', '1', 'yes')
+
+
+def _parse_distribution(value: str) -> Optional[str]:
+    """Extract the distribution name from an image name, or None if unrecognized"""
+    value = value.lower()
+    for distribution in ('ubuntu', 'centos', 'rocky'):
+        if distribution in value:
+            return distribution
+    return None
+
+
+# Environment overrides: (variable name, attribute path on Config, parser).
+# Parsers raise ValueError for invalid input; a None result leaves the value unchanged.
+_ENV_DISPATCH = (
+    ('DB_PATH', ('database_path',), str),
+    ('LOGS_PATH', ('logs_path',), str),
+    ('LOG_LEVEL', ('log_level',), str),
+    ('DEFAULT_IMAGE', ('docker_config', 'default_distribution'), _parse_distribution),
+    ('CONTAINER_NETWORK', ('docker_config', 'network_mode'), str),
+    ('CONTAINER_TIMEOUT', ('docker_config', 'container_timeout'), int),
+    ('DOCKER_PRIVILEGED', ('docker_config', 'privileged'), _parse_bool),
+    ('LOCAL_MODE', ('docker_config', 'local_mode'), _parse_bool),
+    ('USE_AI_VALIDATION', ('validation_config', 'use_ai_validation'), _parse_bool),
+    ('VALIDATION_TIMEOUT', ('validation_config', 'timeout'), int),
+    ('PASSING_THRESHOLD', ('scoring_config', 'passing_threshold'), float),
+    ('TIME_BONUS', ('scoring_config', 'time_bonus'), _parse_bool),
+    ('AI_ENABLED', ('ai_enabled',), _parse_bool),
+)
+
+# Every variable that can affect configuration; used to skip override work in a clean environment
+_OVERRIDE_KEYS = frozenset(
+    [env_name for env_name, _, _ in _ENV_DISPATCH] + ['ANTHROPIC_API_KEY', 'OPENAI_API_KEY']
+)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class DockerConfig:
     """Docker-related configuration"""
     base_image_prefix: str = "lfcs-practice"
@@ -20,6 +66,10 @@ class DockerConfig:
     network_mode: str = "bridge"
     cleanup_on_exit: bool = True
     local_mode: bool = False  # Practice on host system without Docker
+    control_dir: Optional[str] = None  # Host directory for live validation requests
+    tmpfs_mounts: Dict[str, str] = field(default_factory=dict)  # Extra tmpfs mounts: path -> options
+    cap_add: List[str] = field(default_factory=lambda: ["SYS_ADMIN"])  # Needed for systemd
+    cap_drop: List[str] = field(default_factory=list)  # e.g. ["ALL"] to start from no capabilities
     images: Dict[str, str] = field(default_factory=lambda: {
         "ubuntu": "lfcs-practice-ubuntu:latest",
         "centos": "lfcs-practice-centos:latest",
@@ -27,7 +77,7 @@ class DockerConfig:
     })
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ValidationConfig:
     """Validation-related configuration"""
     use_ai_validation: bool = False
@@ -36,7 +86,7 @@ class ValidationConfig:
     timeout: int = 300  # 5 minutes
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ScoringConfig:
     """Scoring-related configuration"""
     passing_threshold: float = 0.70
@@ -49,7 +99,7 @@ class ScoringConfig:
     })
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class AIConfig:
     """AI-related configuration (optional)"""
     provider: str = "anthropic"
@@ -61,7 +111,7 @@ class AIConfig:
     fallback_to_static: bool = True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Main configuration class"""
     # Paths
@@ -112,7 +162,7 @@ class ConfigLoader:
         config = Config()
         
         # Load from YAML file if it exists
-        if os.path.exists(self.config_path):
+        if os.path.isfile(self.config_path):
             config = self._load_from_yaml(config)
         
         # Override with environment variables
@@ -149,12 +199,9 @@ class ConfigLoader:
                 # Extract distribution name from default_image
                 default_image = docker.get('default_image', config.docker_config.default_distribution)
                 # If it's a full image name like "lfcs-practice-ubuntu:latest", extract just "ubuntu"
-                if 'ubuntu' in default_image.lower():
-                    config.docker_config.default_distribution = 'ubuntu'
-                elif 'centos' in default_image.lower():
-                    config.docker_config.default_distribution = 'centos'
-                elif 'rocky' in default_image.lower():
-                    config.docker_config.default_distribution = 'rocky'
+                distribution = _parse_distribution(default_image)
+                if distribution:
+                    config.docker_config.default_distribution = distribution
                 
                 config.docker_config.network_mode = docker.get('network_mode', 
                     config.docker_config.network_mode)
@@ -164,6 +211,12 @@ class ConfigLoader:
                     config.docker_config.local_mode)
                 if 'images' in docker:
                     config.docker_config.images = docker['images']
+                if 'tmpfs_mounts' in docker:
+                    config.docker_config.tmpfs_mounts = docker['tmpfs_mounts']
+                if 'cap_add' in docker:
+                    config.docker_config.cap_add = docker['cap_add']
+                if 'cap_drop' in docker:
+                    config.docker_config.cap_drop = docker['cap_drop']
             
             # Scenarios configuration
             if 'scenarios' in yaml_data:
@@ -244,70 +297,28 @@ class ConfigLoader:
     
     def _override_from_env(self, config: Config) -> Config:
         """Override configuration with environment variables"""
-        # Database path
-        if 'DB_PATH' in os.environ:
-            config.database_path = os.environ['DB_PATH']
-        
-        # Logs path
-        if 'LOGS_PATH' in os.environ:
-            config.logs_path = os.environ['LOGS_PATH']
-        
-        # Log level
-        if 'LOG_LEVEL' in os.environ:
-            config.log_level = os.environ['LOG_LEVEL']
-        
-        # Docker configuration
-        if 'DEFAULT_IMAGE' in os.environ:
-            default_image = os.environ['DEFAULT_IMAGE']
-            # Extract distribution name from image
-            if 'ubuntu' in default_image.lower():
-                config.docker_config.default_distribution = 'ubuntu'
-            elif 'centos' in default_image.lower():
-                config.docker_config.default_distribution = 'centos'
-            elif 'rocky' in default_image.lower():
-                config.docker_config.default_distribution = 'rocky'
-        
-        if 'CONTAINER_NETWORK' in os.environ:
-            config.docker_config.network_mode = os.environ['CONTAINER_NETWORK']
-        
-        if 'CONTAINER_TIMEOUT' in os.environ:
-            try:
-                config.docker_config.container_timeout = int(os.environ['CONTAINER_TIMEOUT'])
-            except ValueError:
-                print(f"Warning: Invalid CONTAINER_TIMEOUT value, using default")
-        
-        if 'DOCKER_PRIVILEGED' in os.environ:
-            config.docker_config.privileged = os.environ['DOCKER_PRIVILEGED'].lower() in ('true', '1', 'yes')
-        
-        if 'LOCAL_MODE' in os.environ:
-            config.docker_config.local_mode = os.environ['LOCAL_MODE'].lower() in ('true', '1', 'yes')
-        
-        # Validation configuration
-        if 'USE_AI_VALIDATION' in os.environ:
-            config.validation_config.use_ai_validation = os.environ['USE_AI_VALIDATION'].lower() in ('true', '1', 'yes')
-        
-        if 'VALIDATION_TIMEOUT' in os.environ:
-            try:
-                config.validation_config.timeout = int(os.environ['VALIDATION_TIMEOUT'])
-            except ValueError:
-                print(f"Warning: Invalid VALIDATION_TIMEOUT value, using default")
+        env = os.environ
+        if _OVERRIDE_KEYS.isdisjoint(env):
+            return config
         
-        # Scoring configuration
-        if 'PASSING_THRESHOLD' in os.environ:
+        for env_name, attr_path, parse in _ENV_DISPATCH:
+            if env_name not in env:
+                continue
             try:
-                config.scoring_config.passing_threshold = float(os.environ['PASSING_THRESHOLD'])
+                value = parse(env[env_name])
             except ValueError:
-                print(f"Warning: Invalid PASSING_THRESHOLD value, using default")
-        
-        if 'TIME_BONUS' in os.environ:
-            config.scoring_config.time_bonus = os.environ['TIME_BONUS'].lower() in ('true', '1', 'yes')
-        
-        # AI enabled flag
-        if 'AI_ENABLED' in os.environ:
-            config.ai_enabled = os.environ['AI_ENABLED'].lower() in ('true', '1', 'yes')
+                print(f"Warning: Invalid {env_name} value, using default")
+                continue
+            if value is None:
+                continue
+            
+            target = config
+            for attr in attr_path[:-1]:
+                target = getattr(target, attr)
+            setattr(target, attr_path[-1], value)
         
         # Enable AI if API key is present
-        if 'ANTHROPIC_API_KEY' in os.environ or 'OPENAI_API_KEY' in os.environ:
+        if 'ANTHROPIC_API_KEY' in env or 'OPENAI_API_KEY' in env:
             config.ai_enabled = True
         
         return config
@@ -333,7 +344,7 @@ class ConfigLoader:
         
         # Validate scoring threshold
         if not 0.0 <= config.scoring_config.passing_threshold <= 1.0:
-            raise ValueError(f"Passing threshold must be between 0.0 and 1.0, got {config.scoring_config.passing_threshold}")
+            raise ValueError(PASSING_THRESHOLD_ERROR.format(config.scoring_config.passing_threshold))
         
         # Validate difficulty multipliers
         for difficulty in config.difficulties:
@@ -351,8 +362,7 @@ class ConfigLoader:
                 config.ai_enabled = False
         
         # Validate log level
-        valid_log_levels = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-        if config.log_level.upper() not in valid_log_levels:
+        if config.log_level.upper() not in VALID_LOG_LEVELS:
             print(f"Warning: Invalid log level '{config.log_level}', using INFO")
             config.log_level = 'INFO'
 
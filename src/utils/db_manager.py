@@ -3,11 +3,13 @@ Database Manager and Scorer for Progress Tracking
 Uses SQLite for local storage
 """
 
+import copy
 import sqlite3
 import os
 import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import logging
@@ -17,6 +19,18 @@ from .error_handler import ErrorHandler, ErrorContext, handle_database_error
 
 logger = logging.getLogger(__name__)
 
+# Special database path for a private, non-persistent database (used by tests)
+MEMORY_DB_PATH = ":memory:"
+
+# Size of each connection's prepared-statement cache (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Kept as one constant so every insert reuses the same cached prepared statement
+_INSERT_ATTEMPT_SQL = (
+    "INSERT INTO attempts (scenario_id, category, difficulty, score, "
+    "max_score, passed, duration, timestamp) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
 
 @dataclass
 class Attempt:
@@ -83,15 +97,129 @@ class Scorer:
     def __init__(self, db_path: str = "database/progress.db"):
         self.db_path = db_path
         self.error_handler = ErrorHandler()
+        self._batch_conn: Optional[sqlite3.Connection] = None
+        # Statistics per category filter, dropped whenever this Scorer writes
+        self._stats_cache: Dict[Optional[str], Statistics] = {}
+        # An in-memory database only lives as long as its connection, so keep one open
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path == MEMORY_DB_PATH:
+            self._conn = self._open_memory_connection()
+        # Only this Scorer can write to a private in-memory database, so only there
+        # is the cache safe; other Scorers or processes may write to a file
+        self._cache_statistics = self._conn is not None
         self._ensure_db_directory()
+        if self._conn is None:
+            self._enable_wal()
         self._init_database()
     
+    @staticmethod
+    def _open_memory_connection() -> sqlite3.Connection:
+        """Open an in-memory database with durability features turned off"""
+        conn = sqlite3.connect(MEMORY_DB_PATH, cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute("PRAGMA journal_mode=MEMORY")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        # Nothing else can open a private in-memory database, so skip per-statement locking
+        conn.execute("PRAGMA locking_mode=EXCLUSIVE")
+        return conn
+    
+    def _open_file_connection(self) -> sqlite3.Connection:
+        """Open a short-lived connection to the on-disk database"""
+        conn = sqlite3.connect(self.db_path, timeout=10.0,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        # Safe with WAL: a crash can lose the last commit but never corrupts the file
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    def _enable_wal(self) -> None:
+        """Switch the on-disk database to write-ahead logging (persists in the file)"""
+        try:
+            conn = sqlite3.connect(self.db_path, timeout=10.0)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+            finally:
+                conn.close()
+        except sqlite3.OperationalError as e:
+            # Not fatal: the database still works with the default rollback journal
+            logger.warning(f"Could not enable WAL journal mode: {e}")
+    
+    def close(self) -> None:
+        """Close the persistent connection held for in-memory databases"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
     def _ensure_db_directory(self):
         """Ensure database directory exists"""
         db_dir = os.path.dirname(self.db_path)
         if db_dir:
             os.makedirs(db_dir, exist_ok=True)
     
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Yield a database connection
+        
+        Inside a batch() block the shared batch connection is reused and left
+        uncommitted. In-memory databases reuse their persistent connection,
+        committed on success and rolled back if the body raises. Otherwise a
+        fresh connection is opened, committed and closed.
+        """
+        if self._batch_conn is not None:
+            yield self._batch_conn
+            return
+        
+        if self._conn is not None:
+            try:
+                yield self._conn
+            except BaseException:
+                # The connection outlives this call, so drop the partial writes now
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+            return
+        
+        conn = self._open_file_connection()
+        try:
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+    
+    @contextmanager
+    def batch(self) -> Iterator['Scorer']:
+        """
+        Group database writes into a single transaction
+        
+        All operations inside the block share one connection and are committed
+        together on exit, or rolled back if the block raises.
+        
+        Example:
+            with scorer.batch():
+                for result in results:
+                    scorer.record_attempt(...)
+        """
+        if self._batch_conn is not None:
+            # Nested batch: join the outer transaction
+            yield self
+            return
+        
+        conn = self._conn or self._open_file_connection()
+        self._batch_conn = conn
+        try:
+            yield self
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # Statistics read inside the batch may include rolled-back writes
+            self._stats_cache.clear()
+            raise
+        finally:
+            self._batch_conn = None
+            if conn is not self._conn:
+                conn.close()
+    
     def _init_database(self):
         """Initialize database schema with error handling"""
         # Read schema from file if it exists
@@ -102,43 +230,43 @@ class Scorer:
         
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(self.db_path, timeout=10.0)
-                cursor = conn.cursor()
+                with self._connection() as conn:
+                    cursor = conn.cursor()
+                    
+                    if os.path.exists(schema_path):
+                        with open(schema_path, 'r') as f:
+                            schema_sql = f.read()
+                            cursor.executescript(schema_sql)
+                    else:
+                        # Fallback to inline schema
+                        cursor.executescript("""
+                            CREATE TABLE IF NOT EXISTS attempts (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                scenario_id TEXT NOT NULL,
+                                category TEXT NOT NULL,
+                                difficulty TEXT NOT NULL,
+                                score INTEGER NOT NULL,
+                                max_score INTEGER NOT NULL,
+                                passed BOOLEAN NOT NULL,
+                                duration INTEGER,
+                                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                            );
+                            
+                            CREATE TABLE IF NOT EXISTS achievements (
+                                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                name TEXT NOT NULL,
+                                description TEXT,
+                                unlocked_at DATETIME
+                            );
+                            
+                            CREATE INDEX IF NOT EXISTS idx_attempts_category ON attempts(category);
+                            CREATE INDEX IF NOT EXISTS idx_attempts_timestamp ON attempts(timestamp);
+                            CREATE INDEX IF NOT EXISTS idx_attempts_difficulty ON attempts(difficulty);
+                            CREATE INDEX IF NOT EXISTS idx_attempts_scenario_id ON attempts(scenario_id);
+                            -- Covers the per-category/difficulty aggregation in get_statistics()
+                            CREATE INDEX IF NOT EXISTS idx_attempts_cat_diff ON attempts(category, difficulty, passed, score);
+                        """)
                 
-                if os.path.exists(schema_path):
-                    with open(schema_path, 'r') as f:
-                        schema_sql = f.read()
-                        cursor.executescript(schema_sql)
-                else:
-                    # Fallback to inline schema
-                    cursor.executescript("""
-                        CREATE TABLE IF NOT EXISTS attempts (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            scenario_id TEXT NOT NULL,
-                            category TEXT NOT NULL,
-                            difficulty TEXT NOT NULL,
-                            score INTEGER NOT NULL,
-                            max_score INTEGER NOT NULL,
-                            passed BOOLEAN NOT NULL,
-                            duration INTEGER,
-                            timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
-                        );
-                        
-                        CREATE TABLE IF NOT EXISTS achievements (
-                            id INTEGER PRIMARY KEY AUTOINCREMENT,
-                            name TEXT NOT NULL,
-                            description TEXT,
-                            unlocked_at DATETIME
-                        );
-                        
-                        CREATE INDEX IF NOT EXISTS idx_attempts_category ON attempts(category);
-                        CREATE INDEX IF NOT EXISTS idx_attempts_timestamp ON attempts(timestamp);
-                        CREATE INDEX IF NOT EXISTS idx_attempts_difficulty ON attempts(difficulty);
-                        CREATE INDEX IF NOT EXISTS idx_attempts_scenario_id ON attempts(scenario_id);
-                    """)
-                
-                conn.commit()
-                conn.close()
                 return  # Success
                 
             except sqlite3.OperationalError as e:
@@ -157,9 +285,10 @@ class Scorer:
                 print(self.error_handler.format_error_for_user(response))
                 raise
     
-    def calculate_score(self, max_score: int, checks_passed: int, 
-                       checks_total: int, difficulty: str,
-                       difficulty_multipliers: Dict[str, float]) -> int:
+    @staticmethod
+    def calculate_score(max_score: int, checks_passed: int,
+                        checks_total: int, difficulty: str,
+                        difficulty_multipliers: Dict[str, float]) -> int:
         """
         Calculate score based on validation results and difficulty
         
@@ -187,7 +316,8 @@ class Scorer:
     
     def record_attempt(self, scenario_id: str, category: str, difficulty: str,
                       score: int, max_score: int, passed: bool,
-                      duration: Optional[int] = None) -> int:
+                      duration: Optional[int] = None,
+                      timestamp: Optional[datetime] = None) -> int:
         """
         Record an attempt in the database with retry logic
         
@@ -199,29 +329,28 @@ class Scorer:
             max_score: Maximum possible score
             passed: Whether the attempt passed
             duration: Duration in seconds
+            timestamp: When the attempt was made (defaults to now)
         
         Returns:
             ID of the recorded attempt
         """
+        if timestamp is None:
+            timestamp = datetime.now()
+        
         max_retries = 3
         retry_delay = 0.5
         
         for attempt in range(max_retries):
             try:
-                conn = sqlite3.connect(self.db_path, timeout=10.0)
-                cursor = conn.cursor()
-                
-                cursor.execute("""
-                    INSERT INTO attempts (scenario_id, category, difficulty, score, 
-                                        max_score, passed, duration, timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (scenario_id, category, difficulty, score, max_score, 
-                      passed, duration, datetime.now()))
-                
-                attempt_id = cursor.lastrowid
-                conn.commit()
-                conn.close()
+                with self._connection() as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute(_INSERT_ATTEMPT_SQL, (scenario_id, category, difficulty, score,
+                                                         max_score, passed, duration, timestamp))
+                    
+                    attempt_id = cursor.lastrowid
                 
+                self._stats_cache.clear()
                 return attempt_id
                 
             except sqlite3.OperationalError as e:
@@ -250,58 +379,114 @@ class Scorer:
                 logger.error(f"Failed to record attempt: {response.message}")
                 raise
     
+    def record_attempts(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """
+        Record several attempts with a single executemany() in one transaction
+        
+        Args:
+            rows: Attempt dicts with the same keys as record_attempt()'s
+                arguments; 'duration' and 'timestamp' may be omitted
+        
+        Returns:
+            Number of attempts recorded
+        """
+        # One timestamp for the whole call; ties are ordered by insertion id
+        now = datetime.now()
+        params = [
+            (row['scenario_id'], row['category'], row['difficulty'], row['score'],
+             row['max_score'], row['passed'], row.get('duration'), row.get('timestamp') or now)
+            for row in rows
+        ]
+        if not params:
+            return 0
+        
+        max_retries = 3
+        retry_delay = 0.5
+        
+        for attempt in range(max_retries):
+            try:
+                with self._connection() as conn:
+                    conn.executemany(_INSERT_ATTEMPT_SQL, params)
+                
+                self._stats_cache.clear()
+                return len(params)
+            
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e).lower() and attempt < max_retries - 1:
+                    logger.warning(f"Database locked, retrying in {retry_delay}s (attempt {attempt + 1}/{max_retries})")
+                    time.sleep(retry_delay)
+                    retry_delay *= 2
+                else:
+                    context = ErrorContext(user_action="record_attempts")
+                    response = self.error_handler.handle_error(e, context)
+                    logger.error(f"Failed to record attempts: {response.message}")
+                    raise
+            except Exception as e:
+                context = ErrorContext(user_action="record_attempts")
+                response = self.error_handler.handle_error(e, context)
+                logger.error(f"Failed to record attempts: {response.message}")
+                raise
+    
     def get_statistics(self, category: Optional[str] = None) -> Statistics:
         """
         Get user statistics, optionally filtered by category
         
+        In-memory Scorers cache the result until their next write; the caller
+        always gets its own copy.
+        
         Args:
             category: Optional category to filter by
         
         Returns:
             Statistics object with all relevant data
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        # Build query based on category filter
-        if category:
-            query = "SELECT * FROM attempts WHERE category = ? ORDER BY timestamp"
-            cursor.execute(query, (category,))
-        else:
-            query = "SELECT * FROM attempts ORDER BY timestamp"
-            cursor.execute(query)
-        
-        attempts = cursor.fetchall()
-        
-        # Calculate overall statistics
-        total_attempts = len(attempts)
-        total_passed = sum(1 for a in attempts if a['passed'])
-        total_score = sum(a['score'] for a in attempts)
-        average_score = total_score / total_attempts if total_attempts > 0 else 0.0
+        cached = self._stats_cache.get(category)
+        if cached is not None:
+            # Callers get their own copy, so changing it can't alter later reads
+            return copy.deepcopy(cached)
         
-        # Calculate statistics by category
-        by_category = self._calculate_category_stats(attempts)
+        where = "WHERE category = ?" if category else ""
+        params = (category,) if category else ()
         
-        # Calculate streaks
-        current_streak, best_streak = self._calculate_streaks(attempts)
-        
-        # Get achievements
-        cursor.execute("SELECT * FROM achievements WHERE unlocked_at IS NOT NULL")
-        achievement_rows = cursor.fetchall()
-        achievements = [
-            Achievement(
-                id=row['id'],
-                name=row['name'],
-                description=row['description'],
-                unlocked_at=datetime.fromisoformat(row['unlocked_at']) if row['unlocked_at'] else None
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            # Let SQLite do the per-category/difficulty aggregation
+            cursor.execute(f"""
+                SELECT category, difficulty, COUNT(*) AS attempts,
+                       SUM(passed) AS passed, SUM(score) AS total_score
+                FROM attempts {where}
+                GROUP BY category, difficulty
+            """, params)
+            by_category = self._calculate_category_stats(cursor.fetchall())
+            
+            # Streaks only need the pass/fail sequence in chronological order
+            cursor.execute(f"SELECT passed FROM attempts {where} ORDER BY timestamp, id", params)
+            current_streak, best_streak = self._calculate_streaks(
+                [row['passed'] for row in cursor.fetchall()]
             )
-            for row in achievement_rows
-        ]
+            
+            # Get achievements
+            cursor.execute("SELECT * FROM achievements WHERE unlocked_at IS NOT NULL")
+            achievement_rows = cursor.fetchall()
+            achievements = [
+                Achievement(
+                    id=row['id'],
+                    name=row['name'],
+                    description=row['description'],
+                    unlocked_at=datetime.fromisoformat(row['unlocked_at']) if row['unlocked_at'] else None
+                )
+                for row in achievement_rows
+            ]
         
-        conn.close()
+        # Overall totals are the sum of the (few) category groups
+        total_attempts = sum(c.attempts for c in by_category.values())
+        total_passed = sum(c.passed for c in by_category.values())
+        total_score = sum(c.total_score for c in by_category.values())
+        average_score = total_score / total_attempts if total_attempts > 0 else 0.0
         
-        return Statistics(
+        statistics = Statistics(
             total_attempts=total_attempts,
             total_passed=total_passed,
             total_score=total_score,
@@ -311,68 +496,54 @@ class Scorer:
             best_streak=best_streak,
             achievements=achievements
         )
+        if self._cache_statistics:
+            self._stats_cache[category] = copy.deepcopy(statistics)
+        return statistics
     
-    def _calculate_category_stats(self, attempts: List[sqlite3.Row]) -> Dict[str, CategoryStats]:
-        """Calculate statistics grouped by category"""
-        category_data = {}
-        
-        for attempt in attempts:
-            cat = attempt['category']
-            if cat not in category_data:
-                category_data[cat] = []
-            category_data[cat].append(attempt)
-        
+    def _calculate_category_stats(self, groups: List[sqlite3.Row]) -> Dict[str, CategoryStats]:
+        """Build category statistics from rows grouped by category and difficulty"""
         result = {}
-        for category, cat_attempts in category_data.items():
-            total_attempts = len(cat_attempts)
-            passed = sum(1 for a in cat_attempts if a['passed'])
-            total_score = sum(a['score'] for a in cat_attempts)
-            avg_score = total_score / total_attempts if total_attempts > 0 else 0.0
-            
-            # Calculate by difficulty
-            by_difficulty = self._calculate_difficulty_stats(cat_attempts)
-            
-            result[category] = CategoryStats(
-                category=category,
-                attempts=total_attempts,
-                passed=passed,
-                total_score=total_score,
-                average_score=avg_score,
-                by_difficulty=by_difficulty
-            )
-        
-        return result
-    
-    def _calculate_difficulty_stats(self, attempts: List[sqlite3.Row]) -> Dict[str, DifficultyStats]:
-        """Calculate statistics grouped by difficulty"""
-        difficulty_data = {}
-        
-        for attempt in attempts:
-            diff = attempt['difficulty']
-            if diff not in difficulty_data:
-                difficulty_data[diff] = []
-            difficulty_data[diff].append(attempt)
         
-        result = {}
-        for difficulty, diff_attempts in difficulty_data.items():
-            total_attempts = len(diff_attempts)
-            passed = sum(1 for a in diff_attempts if a['passed'])
-            total_score = sum(a['score'] for a in diff_attempts)
-            avg_score = total_score / total_attempts if total_attempts > 0 else 0.0
+        for group in groups:
+            category = group['category']
+            if category not in result:
+                result[category] = CategoryStats(
+                    category=category,
+                    attempts=0,
+                    passed=0,
+                    total_score=0,
+                    average_score=0.0,
+                    by_difficulty={}
+                )
+            cat_stats = result[category]
             
-            result[difficulty] = DifficultyStats(
-                difficulty=difficulty,
-                attempts=total_attempts,
-                passed=passed,
-                total_score=total_score,
-                average_score=avg_score
-            )
+            diff_stats = self._calculate_difficulty_stats(group)
+            cat_stats.by_difficulty[diff_stats.difficulty] = diff_stats
+            cat_stats.attempts += diff_stats.attempts
+            cat_stats.passed += diff_stats.passed
+            cat_stats.total_score += diff_stats.total_score
+        
+        for cat_stats in result.values():
+            cat_stats.average_score = cat_stats.total_score / cat_stats.attempts
         
         return result
     
-    def _calculate_streaks(self, attempts: List[sqlite3.Row]) -> Tuple[int, int]:
-        """Calculate current and best streaks"""
-        if not attempts:
+    def _calculate_difficulty_stats(self, group: sqlite3.Row) -> DifficultyStats:
+        """Build difficulty statistics from one aggregated row"""
+        total_attempts = group['attempts']
+        total_score = group['total_score']
+        
+        return DifficultyStats(
+            difficulty=group['difficulty'],
+            attempts=total_attempts,
+            passed=group['passed'],
+            total_score=total_score,
+            average_score=total_score / total_attempts if total_attempts > 0 else 0.0
+        )
+    
+    def _calculate_streaks(self, passed_flags: List[bool]) -> Tuple[int, int]:
+        """Calculate current and best streaks from chronological pass/fail flags"""
+        if not passed_flags:
             return 0, 0
         
         current_streak = 0
@@ -380,16 +551,16 @@ class Scorer:
         temp_streak = 0
         
         # Calculate streaks from most recent to oldest
-        for attempt in reversed(attempts):
-            if attempt['passed']:
+        for passed in reversed(passed_flags):
+            if passed:
                 temp_streak += 1
                 best_streak = max(best_streak, temp_streak)
             else:
                 temp_streak = 0
         
         # Current streak is the streak at the end (most recent)
-        for attempt in reversed(attempts):
-            if attempt['passed']:
+        for passed in reversed(passed_flags):
+            if passed:
                 current_streak += 1
             else:
                 break
@@ -553,31 +724,29 @@ class Scorer:
         Returns:
             ID of the achievement
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if achievement already exists
-        cursor.execute("SELECT id FROM achievements WHERE name = ?", (name,))
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Update unlock time
-            cursor.execute(
-                "UPDATE achievements SET unlocked_at = ? WHERE name = ?",
-                (datetime.now(), name)
-            )
-            achievement_id = existing[0]
-        else:
-            # Create new achievement
-            cursor.execute(
-                "INSERT INTO achievements (name, description, unlocked_at) VALUES (?, ?, ?)",
-                (name, description, datetime.now())
-            )
-            achievement_id = cursor.lastrowid
-        
-        conn.commit()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            # Check if achievement already exists
+            cursor.execute("SELECT id FROM achievements WHERE name = ?", (name,))
+            existing = cursor.fetchone()
+            
+            if existing:
+                # Update unlock time
+                cursor.execute(
+                    "UPDATE achievements SET unlocked_at = ? WHERE name = ?",
+                    (datetime.now(), name)
+                )
+                achievement_id = existing[0]
+            else:
+                # Create new achievement
+                cursor.execute(
+                    "INSERT INTO achievements (name, description, unlocked_at) VALUES (?, ?, ?)",
+                    (name, description, datetime.now())
+                )
+                achievement_id = cursor.lastrowid
         
+        self._stats_cache.clear()
         return achievement_id
     
     def get_all_attempts(self, scenario_id: Optional[str] = None) -> List[Attempt]:
@@ -590,18 +759,17 @@ class Scorer:
         Returns:
             List of Attempt objects
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        if scenario_id:
-            cursor.execute("SELECT * FROM attempts WHERE scenario_id = ? ORDER BY timestamp", 
-                         (scenario_id,))
-        else:
-            cursor.execute("SELECT * FROM attempts ORDER BY timestamp")
-        
-        rows = cursor.fetchall()
-        conn.close()
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
+            
+            if scenario_id:
+                cursor.execute("SELECT * FROM attempts WHERE scenario_id = ? ORDER BY timestamp, id", 
+                             (scenario_id,))
+            else:
+                cursor.execute("SELECT * FROM attempts ORDER BY timestamp, id")
+            
+            rows = cursor.fetchall()
         
         attempts = [
             Attempt(
@@ -625,11 +793,10 @@ class Scorer:
         Reset all progress and statistics
         Deletes all attempts and achievements from the database
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM attempts")
-        cursor.execute("DELETE FROM achievements")
+        with self._connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute("DELETE FROM attempts")
+            cursor.execute("DELETE FROM achievements")
         
-        conn.commit()
-        conn.close()
+        self._stats_cache.clear()
@@ -13,8 +13,6 @@ from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 
-import docker
-from docker.errors import DockerException, ImageNotFound, APIError, NotFound
 import sqlite3
 import yaml
 
@@ -22,6 +20,19 @@ import yaml
 logger = logging.getLogger(__name__)
 
 
+def _docker_error_types(*names: str) -> Tuple[type, ...]:
+    """
+    Look up docker.errors exception classes without importing docker
+    
+    An exception can only be a Docker error if docker.errors is already loaded,
+    so when it isn't an empty tuple (which isinstance() never matches) is returned.
+    """
+    module = sys.modules.get('docker.errors')
+    if module is None:
+        return ()
+    return tuple(getattr(module, name) for name in names)
+
+
 class ErrorCategory(Enum):
     """Categories of errors that can occur"""
     DOCKER = "docker"
@@ -42,9 +53,9 @@ class ErrorSeverity(Enum):
     INFO = "info"          # Informational message
 
 
-@dataclass
+@dataclass(frozen=True)
 class ErrorContext:
-    """Context information for an error"""
+    """Context information for an error (immutable, so one instance can be shared)"""
     scenario_id: Optional[str] = None
     container_id: Optional[str] = None
     user_action: Optional[str] = None
@@ -177,12 +188,11 @@ class ErrorHandler:
     def _categorize_error(self, error: Exception) -> ErrorCategory:
         """Categorize an error based on its type"""
         # Docker errors
-        if isinstance(error, (DockerException, ImageNotFound, APIError, NotFound)):
+        if isinstance(error, _docker_error_types('DockerException', 'ImageNotFound', 'APIError', 'NotFound')):
             return ErrorCategory.DOCKER
         
-        # Database errors
-        if isinstance(error, (sqlite3.Error, sqlite3.DatabaseError, 
-                            sqlite3.IntegrityError, sqlite3.OperationalError)):
+        # Database errors (every sqlite3 exception derives from sqlite3.Error)
+        if isinstance(error, sqlite3.Error):
             return ErrorCategory.DATABASE
         
         # YAML/Scenario errors
@@ -210,7 +220,7 @@ class ErrorHandler:
                            category: ErrorCategory) -> ErrorSeverity:
         """Determine severity of an error"""
         # Critical errors that prevent system operation
-        if isinstance(error, DockerException) and "not running" in str(error).lower():
+        if isinstance(error, _docker_error_types('DockerException')) and "not running" in str(error).lower():
             return ErrorSeverity.CRITICAL
         
         if isinstance(error, sqlite3.DatabaseError) and "corrupt" in str(error).lower():
@@ -265,7 +275,7 @@ class ErrorHandler:
                 "Without Docker, the tool cannot create these safe practice environments."
             )
         
-        if isinstance(error, ImageNotFound):
+        if isinstance(error, _docker_error_types('ImageNotFound')):
             return (
                 f"Docker image not found.\n"
                 f"The required base image for this scenario is not available on your system."
@@ -442,7 +452,7 @@ class ErrorHandler:
                 "Verify Docker installation: docker --version"
             ])
         
-        elif isinstance(error, ImageNotFound):
+        elif isinstance(error, _docker_error_types('ImageNotFound')):
             suggestions.extend([
                 "Build base images: cd docker/base_images && ./build_all.sh",
                 "Pull image manually: docker pull <image-name>",
@@ -705,6 +715,7 @@ class ErrorHandler:
         
         # Docker status
         try:
+            import docker
             client = docker.from_env()
             client.ping()
             state['docker_available'] = True
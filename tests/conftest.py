@@ -0,0 +1,18 @@
+"""
+Shared pytest configuration for the LFCS Practice Tool tests
+"""
+
+import os
+
+from hypothesis import settings
+
+
+# Property test budgets, chosen with LFCS_TEST_PROFILE (default "dev"):
+# - dev: a quick local run with fresh examples
+# - ci: a larger, derandomized run, so a failure reproduces on every rerun
+# - nightly: the largest budget, exploring with fresh examples
+# No deadlines: the Docker and database properties have legitimately slow examples.
+settings.register_profile("dev", max_examples=25, deadline=None)
+settings.register_profile("ci", max_examples=100, deadline=None, derandomize=True)
+settings.register_profile("nightly", max_examples=1000, deadline=None)
+settings.load_profile(os.environ.get("LFCS_TEST_PROFILE", "dev"))
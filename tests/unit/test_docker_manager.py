@@ -6,36 +6,49 @@ Tests container isolation and multi-distribution compatibility
 import pytest
 import docker
 from hypothesis import given, strategies as st, settings, assume, HealthCheck
-from docker.errors import DockerException, ImageNotFound
+from docker.errors import APIError, DockerException, ImageNotFound
+import dataclasses
+import functools
 import os
-import tempfile
+import string
 import time
+import uuid
+from unittest.mock import MagicMock
 
 from src.docker_manager.container import DockerManager, ExecutionResult
 from src.utils.config import DockerConfig
 from src.core.models import Scenario, ValidationRules, CommandCheck
 
 
-# Check if Docker is available
-def is_docker_available():
-    """Check if Docker daemon is available"""
+@functools.lru_cache(maxsize=1)
+def _cached_docker_client():
+    """Connect to the Docker daemon once per process; returns (client, available, error)"""
     try:
         client = docker.from_env()
         client.ping()
-        return True
-    except:
-        return False
+        return client, True, None
+    except Exception as e:
+        return None, False, e
 
 
-# Skip all tests if Docker is not available
-pytestmark = pytest.mark.skipif(
-    not is_docker_available(),
-    reason="Docker daemon not available"
-)
+# Fixtures
+@pytest.fixture(scope="session")
+def docker_client():
+    """
+    Docker client shared by the session's tests
+    
+    The daemon is only contacted once a test from this module actually runs, so
+    collecting or deselecting these tests never pays for a ping. If it isn't
+    available, every test here is skipped: they all depend on this fixture
+    through the autouse available_distributions fixture.
+    """
+    client, available, error = _cached_docker_client()
+    if not available:
+        pytest.skip(f"Docker daemon not available: {error}")
+    return client
 
 
-# Fixtures
-@pytest.fixture
+@pytest.fixture(scope="session")
 def docker_config():
     """Create a test Docker configuration"""
     return DockerConfig(
@@ -49,14 +62,109 @@ def docker_config():
             "ubuntu": "ubuntu:22.04",
             "centos": "centos:stream9",
             "rocky": "rockylinux:9"
-        }
+        },
+        # Scratch files written by the tests stay in RAM instead of the overlay filesystem
+        tmpfs_mounts={"/tmp": "rw,size=64m"}
     )
 
 
-@pytest.fixture
-def docker_manager(docker_config):
-    """Create a Docker manager instance"""
-    return DockerManager(docker_config)
+@pytest.fixture(scope="session")
+def minimal_docker_config(docker_config):
+    """
+    Unprivileged, networkless variant of docker_config
+    
+    The commands these tests run need no capabilities or network, and skipping
+    the bridge setup makes containers start faster.
+    """
+    return dataclasses.replace(
+        docker_config,
+        privileged=False,
+        network_mode="none",
+        cap_add=[],
+        cap_drop=["ALL"]
+    )
+
+
+@pytest.fixture(scope="session")
+def docker_manager(minimal_docker_config, docker_client):
+    """Create one Docker manager (and daemon connection) for the whole session"""
+    return DockerManager(minimal_docker_config, client=docker_client)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def available_distributions(docker_manager, docker_config):
+    """
+    Pull every configured image once, before any test runs
+    
+    Keeps image pulls out of timed Hypothesis examples. Returns the
+    distributions whose image is available locally.
+    """
+    available = set()
+    for distribution, image in docker_config.images.items():
+        try:
+            docker_manager.client.images.get(image)
+        except ImageNotFound:
+            try:
+                docker_manager.client.images.pull(image)
+            except (ImageNotFound, APIError):
+                continue
+        available.add(distribution)
+    return frozenset(available)
+
+
+class ContainerPool:
+    """
+    Warm containers per distribution for the property tests
+    
+    Released containers have their scratch locations wiped and are handed out
+    again, instead of being destroyed and recreated for every example.
+    """
+    
+    RESET_COMMAND = "sh -c 'rm -rf /tmp/* /tmp/.[!.]* /root/.bash_history 2>/dev/null; true'"
+    
+    def __init__(self, manager):
+        self.manager = manager
+        self._idle = {}
+        self._distribution_of = {}
+    
+    def acquire(self, distribution, scenario):
+        """Check out an idle container, creating one if none is available"""
+        idle = self._idle.setdefault(distribution, [])
+        if idle:
+            return idle.pop()
+        container = self.manager.create_container(distribution, scenario)
+        self._distribution_of[container.id] = distribution
+        return container
+    
+    def release(self, container):
+        """Reset a container and return it to the pool, or destroy it if the reset fails"""
+        distribution = self._distribution_of[container.id]
+        try:
+            result = self.manager.execute_command(container, self.RESET_COMMAND)
+            reset_ok = result.exit_code == 0
+        except Exception:
+            reset_ok = False
+        
+        if reset_ok:
+            self._idle[distribution].append(container)
+        else:
+            del self._distribution_of[container.id]
+            self.manager.destroy_container(container)
+    
+    def close(self):
+        """Destroy every idle container"""
+        for idle in self._idle.values():
+            while idle:
+                self.manager.destroy_container(idle.pop())
+        self._distribution_of.clear()
+
+
+@pytest.fixture(scope="session")
+def container_pool(docker_manager):
+    """Session-wide pool of reusable containers"""
+    pool = ContainerPool(docker_manager)
+    yield pool
+    pool.close()
 
 
 @pytest.fixture
@@ -80,40 +188,33 @@ def simple_scenario():
 
 
 # Strategy generators for property-based testing
+
+# Fixed ASCII pool, so draws don't walk the Unicode category tables
+_ALNUM_ALPHABET = st.sampled_from(string.ascii_letters + string.digits)
+
+
 @st.composite
 def scenario_generator(draw):
-    """Generate random but valid scenarios"""
-    categories = ['networking', 'storage', 'users_groups', 
-                  'operations_deployment', 'essential_commands']
-    difficulties = ['easy', 'medium', 'hard']
-    distributions = [None, 'ubuntu', 'centos', 'rocky']
+    """
+    Generate valid scenarios that differ only in their ID
     
+    Category, difficulty, setup commands and points don't affect container
+    isolation or distribution compatibility, so they are pinned to keep
+    generation and shrinking focused on what matters.
+    """
     scenario_id = f"test-{draw(st.integers(min_value=1, max_value=10000))}"
-    category = draw(st.sampled_from(categories))
-    difficulty = draw(st.sampled_from(difficulties))
-    distribution = draw(st.sampled_from(distributions))
-    
-    # Generate simple setup commands
-    setup_commands = draw(st.lists(
-        st.sampled_from([
-            "echo 'setup'",
-            "mkdir -p /tmp/test",
-            "touch /tmp/testfile"
-        ]),
-        max_size=3
-    ))
     
     return Scenario(
         id=scenario_id,
-        category=category,
-        difficulty=difficulty,
-        task=f"Test task for {category}",
+        category="essential_commands",
+        difficulty="easy",
+        task="Test task for essential_commands",
         validation=ValidationRules(checks=[
             CommandCheck(command="echo test", expected_output="test")
         ]),
-        points=draw(st.integers(min_value=10, max_value=100)),
-        distribution=distribution,
-        setup_commands=setup_commands,
+        points=10,
+        distribution=None,
+        setup_commands=[],
         hints=[],
         time_limit=None,
         tags=[]
@@ -123,113 +224,81 @@ def scenario_generator(draw):
 @st.composite
 def file_path_generator(draw):
     """Generate valid file paths for testing"""
-    filename = draw(st.text(
-        alphabet=st.characters(whitelist_categories=('Lu', 'Ll', 'Nd')),
-        min_size=1,
-        max_size=20
-    ))
+    filename = draw(st.text(alphabet=_ALNUM_ALPHABET, min_size=1, max_size=20))
     return f"/tmp/test_{filename}.txt"
 
 
 # Feature: lfcs-practice-environment, Property 3: Container isolation
-@settings(
-    max_examples=100,
-    deadline=60000,  # 60 seconds per test
-    suppress_health_check=[HealthCheck.function_scoped_fixture, HealthCheck.too_slow]
-)
+@settings(suppress_health_check=[HealthCheck.too_slow])
 @given(
-    scenario1=scenario_generator(),
-    scenario2=scenario_generator(),
+    scenario=scenario_generator(),
     test_file_path=file_path_generator()
 )
-def test_container_isolation_property(docker_manager, scenario1, scenario2, test_file_path):
+def test_container_isolation_property(docker_manager, container_pool, scenario, test_file_path):
     """
     Property 3: Container isolation
     
-    For any practice session, when a container is created and destroyed,
-    no artifacts from that session should persist on the host system or
-    affect subsequent sessions.
+    For any practice session, artifacts written by that session should not be
+    visible to other sessions or persist on the host system. Each example writes
+    in one pooled container and looks for the file in a second one held at the
+    same time; destroying a container is covered once by
+    test_destroyed_container_leaves_no_host_artifacts.
     
     Validates: Requirements 2.1, 2.4
     """
-    # Use ubuntu for faster testing
-    distribution = "ubuntu"
+    filename = os.path.basename(test_file_path)
+    session_dir = f"/tmp/iso-{uuid.uuid4().hex}"
+    session_path = f"{session_dir}/{filename}"
+    test_content = f"test_content_{scenario.id}"
     
-    container1 = None
-    container2 = None
+    # Use ubuntu for faster testing; both are checked out at once, so they differ
+    container = container_pool.acquire("ubuntu", scenario)
+    other_container = None
     
     try:
-        # Create first container and create a file
-        container1 = docker_manager.create_container(distribution, scenario1)
+        other_container = container_pool.acquire("ubuntu", scenario)
         
         # Create a unique file in the first container
-        test_content = f"test_content_{scenario1.id}"
-        result1 = docker_manager.execute_command(
-            container1,
-            f"echo '{test_content}' > {test_file_path}"
+        result = docker_manager.execute_command(
+            container,
+            f"sh -c \"mkdir -p {session_dir} && echo '{test_content}' > {session_path}\""
         )
-        assert result1.exit_code == 0, "Failed to create test file in container1"
+        assert result.exit_code == 0, "Failed to create test file in container"
         
-        # Verify file exists in container1
-        result2 = docker_manager.execute_command(
-            container1,
-            f"cat {test_file_path}"
-        )
-        assert result2.exit_code == 0, "File should exist in container1"
-        assert test_content in result2.output, "File content should match in container1"
+        # Verify the file exists in the container that wrote it
+        result = docker_manager.execute_command(container, f"cat {session_path}")
+        assert result.exit_code == 0, "File should exist in the container that wrote it"
+        assert test_content in result.output, "File content should match"
         
-        # Destroy first container
-        docker_manager.destroy_container(container1)
-        container1 = None
+        # The other container must not see it
+        result = docker_manager.execute_command(other_container, f"cat {session_path}")
+        assert result.exit_code != 0, \
+            "File from one container should not be visible in another container"
         
         # Verify file doesn't exist on host
-        assert not os.path.exists(test_file_path), \
+        assert not os.path.exists(session_path), \
             "File from container should not exist on host system"
         
-        # Create second container
-        container2 = docker_manager.create_container(distribution, scenario2)
-        
-        # Verify file from first container doesn't exist in second container
-        result3 = docker_manager.execute_command(
-            container2,
-            f"cat {test_file_path}"
-        )
-        # File should not exist (exit code should be non-zero)
-        assert result3.exit_code != 0, \
-            "File from first container should not exist in second container"
-        
-        # Verify second container has clean state
-        result4 = docker_manager.execute_command(
-            container2,
-            "ls /tmp | wc -l"
-        )
-        assert result4.exit_code == 0, "Should be able to list /tmp in container2"
-        
     finally:
-        # Cleanup
-        if container1:
-            try:
-                docker_manager.destroy_container(container1)
-            except:
-                pass
-        if container2:
-            try:
-                docker_manager.destroy_container(container2)
-            except:
-                pass
+        if other_container is not None:
+            container_pool.release(other_container)
+        container_pool.release(container)
 
 
 # Feature: lfcs-practice-environment, Property 11: Multi-distribution compatibility
+# One parameter per distribution, each kept on its own xdist worker so that worker's
+# image cache and pooled container stay warm for all of its examples
+@pytest.mark.parametrize("distribution", [
+    pytest.param(distribution, marks=pytest.mark.xdist_group(f"distro_{distribution}"))
+    for distribution in ['ubuntu', 'centos', 'rocky']
+])
 @settings(
-    max_examples=100,
-    deadline=60000,  # 60 seconds per test
-    suppress_health_check=[HealthCheck.function_scoped_fixture, HealthCheck.too_slow]
-)
-@given(
-    scenario=scenario_generator(),
-    distribution=st.sampled_from(['ubuntu', 'centos', 'rocky'])
+    max_examples=max(1, settings().max_examples // 3),  # per distribution
+    suppress_health_check=[HealthCheck.too_slow]
 )
-def test_multi_distribution_compatibility_property(docker_manager, scenario, distribution):
+@given(scenario=scenario_generator())
+def test_multi_distribution_compatibility_property(docker_manager, container_pool, available_distributions,
+                                                   distribution, scenario):
     """
     Property 11: Multi-distribution compatibility
     
@@ -238,6 +307,9 @@ def test_multi_distribution_compatibility_property(docker_manager, scenario, dis
     
     Validates: Requirements 8.1, 8.4
     """
+    if distribution not in available_distributions:
+        pytest.skip(f"Image for {distribution} could not be pulled")
+    
     # Make scenario distribution-agnostic
     scenario.distribution = None
     
@@ -245,7 +317,7 @@ def test_multi_distribution_compatibility_property(docker_manager, scenario, dis
     
     try:
         # Create container with specified distribution
-        container = docker_manager.create_container(distribution, scenario)
+        container = container_pool.acquire(distribution, scenario)
         
         # Verify container was created successfully
         assert container is not None, f"Container should be created for {distribution}"
@@ -263,31 +335,30 @@ def test_multi_distribution_compatibility_property(docker_manager, scenario, dis
             "ls /",
         ]
         
-        for cmd in basic_commands:
-            result = docker_manager.execute_command(container, cmd)
+        # Verify we can create files
+        test_file = f"/tmp/test_{scenario.id}.txt"
+        file_command = f"echo 'test content' > {test_file} && cat {test_file}"
+        
+        # Run everything in one exec round-trip
+        *basic_results, file_result = docker_manager.execute_batch(
+            container, basic_commands + [file_command]
+        )
+        
+        for cmd, result in zip(basic_commands, basic_results):
             assert result.exit_code == 0, \
                 f"Command '{cmd}' should succeed on {distribution} (exit code: {result.exit_code})"
             assert result.output is not None, \
                 f"Command '{cmd}' should produce output on {distribution}"
         
-        # Verify we can create files
-        test_file = f"/tmp/test_{scenario.id}.txt"
-        result = docker_manager.execute_command(
-            container,
-            f"echo 'test content' > {test_file} && cat {test_file}"
-        )
-        assert result.exit_code == 0, \
+        assert file_result.exit_code == 0, \
             f"Should be able to create and read files on {distribution}"
-        assert "test content" in result.output, \
+        assert "test content" in file_result.output, \
             f"File operations should work correctly on {distribution}"
         
     finally:
-        # Cleanup
+        # Return container to the pool
         if container:
-            try:
-                docker_manager.destroy_container(container)
-            except:
-                pass
+            container_pool.release(container)
 
 
 # Unit tests for specific functionality
@@ -333,6 +404,22 @@ class TestDockerManagerUnit:
                     pass
             raise
     
+    def test_destroyed_container_leaves_no_host_artifacts(self, docker_manager, simple_scenario):
+        """Test that files written in a destroyed container never reach the host"""
+        test_file_path = f"/tmp/test_isolation_{uuid.uuid4().hex}.txt"
+        container = docker_manager.create_container("ubuntu", simple_scenario)
+        try:
+            result = docker_manager.execute_command(
+                container,
+                f"sh -c \"echo 'isolated' > {test_file_path}\""
+            )
+            assert result.exit_code == 0
+        finally:
+            docker_manager.destroy_container(container)
+        
+        assert not os.path.exists(test_file_path), \
+            "File from container should not exist on host system"
+    
     def test_execute_command(self, docker_manager, simple_scenario):
         """Test command execution in container"""
         container = None
@@ -349,33 +436,22 @@ class TestDockerManagerUnit:
                 docker_manager.destroy_container(container)
     
     def test_copy_to_container(self, docker_manager, simple_scenario):
-        """Test copying files to container"""
+        """Test copying in-memory file contents to container"""
         container = None
-        temp_file = None
         
         try:
-            # Create temporary file
-            with tempfile.NamedTemporaryFile(mode='w', delete=False) as f:
-                f.write("test content")
-                temp_file = f.name
-            
             container = docker_manager.create_container("ubuntu", simple_scenario)
             
-            # Copy file to container
-            docker_manager.copy_to_container(container, temp_file, "/tmp/")
+            # Copy file to container; not into /tmp, which is a tmpfs here and
+            # the archive API writes underneath tmpfs mounts, not into them
+            docker_manager.copy_bytes_to_container(container, "/root", "copied.txt", b"test content")
             
             # Verify file exists in container
-            filename = os.path.basename(temp_file)
-            result = docker_manager.execute_command(
-                container,
-                f"cat /tmp/{filename}"
-            )
+            result = docker_manager.execute_command(container, "cat /root/copied.txt")
             assert result.exit_code == 0
             assert "test content" in result.output
             
         finally:
-            if temp_file and os.path.exists(temp_file):
-                os.unlink(temp_file)
             if container:
                 docker_manager.destroy_container(container)
     
@@ -384,12 +460,51 @@ class TestDockerManagerUnit:
         container = None
         try:
             container = docker_manager.create_container("ubuntu", simple_scenario)
-            shell_cmd = docker_manager.get_container_shell(container)
+            cmd_parts = docker_manager.get_container_shell(container)
             
-            assert "docker exec -it" in shell_cmd
-            assert container.name in shell_cmd
-            assert "/bin/bash" in shell_cmd
+            assert cmd_parts[:3] == ["docker", "exec", "-it"]
+            assert container.name in cmd_parts
+            assert cmd_parts[-1] == "/bin/bash"
+            assert docker_manager.get_container_shell_str(container) == " ".join(cmd_parts)
             
         finally:
             if container:
                 docker_manager.destroy_container(container)
+
+
+class TestKnownImages:
+    """Tests for the local image tag cache, against a mocked Docker client"""
+    
+    @pytest.fixture
+    def available_distributions(self):
+        """Override the module's autouse image pull: these tests need no daemon"""
+        return frozenset()
+    
+    def test_known_images_filled_lazily(self, minimal_docker_config, simple_scenario):
+        """Test that images are looked up on first use only, not listed at startup"""
+        client = MagicMock()
+        client.containers.run.return_value = MagicMock(short_id="abc123")
+        manager = DockerManager(minimal_docker_config, client=client)
+        
+        client.images.list.assert_not_called()
+        assert manager._known_images == set()
+        
+        manager.create_container("ubuntu", simple_scenario)
+        manager.create_container("ubuntu", simple_scenario)
+        
+        client.images.get.assert_called_once_with("ubuntu:22.04")
+        assert manager._known_images == {"ubuntu:22.04"}
+    
+    def test_removed_known_image_is_rechecked(self, minimal_docker_config, simple_scenario):
+        """Test that an image removed after its first use goes through _ensure_image again"""
+        client = MagicMock()
+        container = MagicMock(short_id="abc123")
+        client.containers.run.side_effect = [container, ImageNotFound("image removed"), container]
+        manager = DockerManager(minimal_docker_config, client=client)
+        
+        manager.create_container("ubuntu", simple_scenario)
+        assert manager.create_container("ubuntu", simple_scenario) is container
+        
+        assert client.images.get.call_count == 2
+        assert client.containers.run.call_count == 3
+        assert "ubuntu:22.04" in manager._known_images
@@ -7,11 +7,12 @@ import pytest
 import tempfile
 import os
 import shutil
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, patch, create_autospec
 from hypothesis import given, strategies as st, settings, assume, HealthCheck
 from datetime import datetime
 
 from src.core.engine import Engine, SessionResult
+from src.docker_manager.container import DockerManager
 from src.core.models import (
     Scenario, ValidationRules, CommandCheck, FileCheck, 
     ServiceCheck, CustomCheck
@@ -85,6 +86,23 @@ def validation_result_strategy():
     return _validation_result()
 
 
+@pytest.fixture(scope="session")
+def _docker_mock_template():
+    """
+    Autospecced DockerManager, built once per session
+    
+    Building an autospec walks the whole class, so tests reset and reconfigure
+    this one instance instead of constructing a fresh mock each time.
+    """
+    return create_autospec(DockerManager, spec_set=True, instance=True)
+
+
+def _reset_docker_mock(mock):
+    """Clear calls, return values and side effects left by a previous test"""
+    mock.reset_mock(return_value=True, side_effect=True)
+    return mock
+
+
 class TestEngine:
     """Test suite for Engine class"""
     
@@ -127,13 +145,11 @@ points: 10
         return config
     
     @pytest.fixture
-    def mock_docker_manager(self):
+    def mock_docker_manager(self, _docker_mock_template):
         """Create mock Docker manager"""
-        mock = Mock()
-        mock.create_container = Mock(return_value=Mock(short_id="abc123", name="test-container"))
-        mock.execute_command = Mock()
-        mock.destroy_container = Mock()
-        mock.get_container_shell = Mock(return_value="docker exec -it test-container /bin/bash")
+        mock = _reset_docker_mock(_docker_mock_template)
+        mock.create_container.return_value = Mock(short_id="abc123", name="test-container")
+        mock.get_container_shell.return_value = ["docker", "exec", "-it", "test-container", "/bin/bash"]
         return mock
     
     @pytest.fixture
@@ -153,10 +169,10 @@ points: 10
         ))
         return mock
     
-    def test_engine_initialization(self, test_config):
+    def test_engine_initialization(self, test_config, mock_docker_manager):
         """Test that engine initializes correctly"""
         with patch('src.core.engine.DockerManager') as mock_docker:
-            mock_docker.return_value = Mock()
+            mock_docker.return_value = mock_docker_manager
             
             engine = Engine(test_config)
             
@@ -168,10 +184,10 @@ points: 10
             assert engine.current_session_id is None
             assert engine.current_container is None
     
-    def test_get_statistics(self, test_config):
+    def test_get_statistics(self, test_config, mock_docker_manager):
         """Test retrieving statistics"""
         with patch('src.core.engine.DockerManager') as mock_docker:
-            mock_docker.return_value = Mock()
+            mock_docker.return_value = mock_docker_manager
             
             engine = Engine(test_config)
             
@@ -192,10 +208,10 @@ points: 10
             assert stats.total_passed == 1
             assert stats.total_score == 10
     
-    def test_list_scenarios(self, test_config):
+    def test_list_scenarios(self, test_config, mock_docker_manager):
         """Test listing scenarios"""
         with patch('src.core.engine.DockerManager') as mock_docker:
-            mock_docker.return_value = Mock()
+            mock_docker.return_value = mock_docker_manager
             
             engine = Engine(test_config)
             
@@ -204,10 +220,10 @@ points: 10
             assert len(scenarios) >= 1
             assert all(isinstance(s, Scenario) for s in scenarios)
     
-    def test_list_scenarios_with_filters(self, test_config):
+    def test_list_scenarios_with_filters(self, test_config, mock_docker_manager):
         """Test listing scenarios with category and difficulty filters"""
         with patch('src.core.engine.DockerManager') as mock_docker:
-            mock_docker.return_value = Mock()
+            mock_docker.return_value = mock_docker_manager
             
             engine = Engine(test_config)
             
@@ -217,6 +233,34 @@ points: 10
             assert all(s.difficulty == "easy" for s in scenarios)
 
 
+@pytest.fixture(scope="session")
+def recovery_workdir(tmp_path_factory):
+    """
+    Working directory for the error-recovery property, set up once per session
+    
+    Holds the logs directory and a single storage/easy scenario.
+    """
+    workdir = str(tmp_path_factory.mktemp("lfcs_recovery"))
+    os.makedirs(os.path.join(workdir, "logs"))
+    scenario_dir = os.path.join(workdir, "scenarios", "storage", "easy")
+    os.makedirs(scenario_dir)
+    
+    with open(os.path.join(scenario_dir, "test.yaml"), 'w', encoding='utf-8') as f:
+        f.write("""id: test-scenario-01
+category: storage
+difficulty: easy
+task: Create a test directory
+validation:
+  checks:
+    - type: command
+      command: "echo test"
+      expected_exit_code: 0
+points: 10
+""")
+    
+    return workdir
+
+
 class TestErrorRecovery:
     """Test suite for error recovery and data persistence"""
     
@@ -250,7 +294,8 @@ class TestErrorRecovery:
         deadline=None,
         suppress_health_check=[HealthCheck.function_scoped_fixture, HealthCheck.too_slow]
     )
-    def test_error_recovery_without_data_loss(self, error_stage, seed):
+    def test_error_recovery_without_data_loss(self, _docker_mock_template, recovery_workdir,
+                                              error_stage, seed):
         """
         **Validates: Requirements 11.3, 11.4**
         
@@ -262,52 +307,31 @@ class TestErrorRecovery:
         2. Simulate an error at different stages of session execution
         3. Verify that previously recorded data is still intact
         """
-        # Create a fresh temp directory for this test run
-        temp_dir = tempfile.mkdtemp(suffix=f"_{seed}")
+        # Only the database is per-example; logs and scenarios are shared
+        config = Config()
+        db_path = os.path.join(recovery_workdir, f"db_{error_stage}_{seed}.db")
+        config.database_path = db_path
+        config.logs_path = os.path.join(recovery_workdir, "logs")
+        config.scenarios_path = os.path.join(recovery_workdir, "scenarios")
         
         try:
-            # Create a fresh config for this test
-            config = Config()
-            db_path = os.path.join(temp_dir, f"test_{error_stage}_{seed}.db")
-            config.database_path = db_path
-            config.logs_path = os.path.join(temp_dir, "logs")
-            config.scenarios_path = os.path.join(temp_dir, "scenarios")
-            
-            os.makedirs(config.logs_path, exist_ok=True)
-            os.makedirs(config.scenarios_path, exist_ok=True)
-            
-            # Create a simple valid scenario file
-            os.makedirs(os.path.join(config.scenarios_path, "storage", "easy"), exist_ok=True)
-            scenario_file = os.path.join(config.scenarios_path, "storage", "easy", "test.yaml")
-            
-            with open(scenario_file, 'w', encoding='utf-8') as f:
-                f.write("""id: test-scenario-01
-category: storage
-difficulty: easy
-task: Create a test directory
-validation:
-  checks:
-    - type: command
-      command: "echo test"
-      expected_exit_code: 0
-points: 10
-""")
-            
             # Step 1: Record initial attempts
             scorer = Scorer(config.database_path)
             
-            initial_attempts = []
-            for i in range(3):
-                attempt_id = scorer.record_attempt(
-                    scenario_id=f"initial-{seed}-{i}",
-                    category="storage",
-                    difficulty="easy",
-                    score=10 * (i + 1),
-                    max_score=100,
-                    passed=True,
-                    duration=60
-                )
-                initial_attempts.append(attempt_id)
+            # One transaction for all of them
+            recorded = scorer.record_attempts(
+                {
+                    'scenario_id': f"initial-{seed}-{i}",
+                    'category': "storage",
+                    'difficulty': "easy",
+                    'score': 10 * (i + 1),
+                    'max_score': 100,
+                    'passed': True,
+                    'duration': 60
+                }
+                for i in range(3)
+            )
+            assert recorded == 3
             
             # Verify initial data is recorded
             initial_stats = scorer.get_statistics()
@@ -317,17 +341,16 @@ points: 10
             
             # Step 2: Simulate error during session
             with patch('src.core.engine.DockerManager') as mock_docker_class:
-                mock_docker = Mock()
+                mock_docker = _reset_docker_mock(_docker_mock_template)
                 mock_container = Mock(short_id="test123", name="test-container")
                 
                 if error_stage == 'container_creation':
                     # Simulate container creation failure
-                    mock_docker.create_container = Mock(side_effect=Exception("Container creation failed"))
+                    mock_docker.create_container.side_effect = Exception("Container creation failed")
                 elif error_stage == 'validation':
                     # Container creation succeeds, but validation fails
-                    mock_docker.create_container = Mock(return_value=mock_container)
-                    mock_docker.get_container_shell = Mock(return_value="docker exec -it test /bin/bash")
-                    mock_docker.destroy_container = Mock()
+                    mock_docker.create_container.return_value = mock_container
+                    mock_docker.get_container_shell.return_value = ["docker", "exec", "-it", "test", "/bin/bash"]
                 
                 mock_docker_class.return_value = mock_docker
                 
@@ -376,8 +399,10 @@ points: 10
                 f"Score data corrupted: expected {initial_total_score}, got {preserved_score}"
         
         finally:
-            # Clean up temp directory
-            shutil.rmtree(temp_dir, ignore_errors=True)
+            # Remove this example's database (and any WAL side files)
+            for path in (db_path, f"{db_path}-wal", f"{db_path}-shm"):
+                if os.path.exists(path):
+                    os.unlink(path)
 
 
 if __name__ == "__main__":
@@ -2,9 +2,12 @@
 Unit tests for Error Handler
 """
 
+import dataclasses
+import os
 import pytest
 import sqlite3
-import docker
+import subprocess
+import sys
 from docker.errors import DockerException, ImageNotFound, APIError
 import yaml
 
@@ -14,6 +17,86 @@ from src.utils.error_handler import (
 )
 
 
+# Everything here is a unit test; the few that probe the real system or spawn an
+# interpreter are also marked slow, so `pytest -m "not slow"` skips them
+pytestmark = pytest.mark.unit
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Canonical errors shared by the tests below; never raised, so they carry no traceback
+_DB_LOCKED_ERROR = sqlite3.OperationalError("database is locked")
+_DOCKER_DOWN_ERROR = DockerException("Docker daemon is not running")
+_FILE_NOT_FOUND_ERROR = FileNotFoundError("file not found")
+_IMAGE_NOT_FOUND_ERROR = ImageNotFound("Image not found")
+
+
+@pytest.fixture(scope="session")
+def worker_log_dir(tmp_path_factory, worker_id):
+    """Log directory private to this pytest-xdist worker ("master" when not distributed)"""
+    return tmp_path_factory.mktemp(f"logs-{worker_id}")
+
+
+# Stand-in for the Docker/disk probe that handling a critical error logs
+_CANNED_SYSTEM_STATE = {
+    'python_version': sys.version,
+    'cwd': '/',
+    'docker_available': False,
+}
+
+
+@pytest.fixture(scope="module")
+def handler(worker_log_dir):
+    """
+    One error handler for the module; handle_error() keeps no per-call state
+    
+    Its system state probe is stubbed out; TestSystemState covers the real one.
+    """
+    handler = ErrorHandler(log_path=str(worker_log_dir))
+    handler._get_system_state = lambda: dict(_CANNED_SYSTEM_STATE)
+    return handler
+
+
+@pytest.fixture(scope="module")
+def context():
+    """Minimal error context, shared by the module; ErrorContext is frozen"""
+    return ErrorContext(user_action="test")
+
+
+@pytest.fixture(scope="module")
+def docker_not_running_response(handler, context):
+    """
+    Response for a Docker-daemon-down error, handled once per module
+    
+    Tests only read the response, so they can all share it.
+    """
+    return handler.handle_error(_DOCKER_DOWN_ERROR, context)
+
+
+@pytest.fixture(scope="module")
+def docker_not_running_formatted(handler, docker_not_running_response):
+    """docker_not_running_response formatted for the user"""
+    return handler.format_error_for_user(docker_not_running_response)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_error_handler(handler, context):
+    """
+    Pay one-time costs (the lazy colors import, first logger calls) during setup
+    
+    Keeps them out of whichever test happens to run first, so --durations
+    reports comparable call times regardless of test order.
+    """
+    handler.format_error_for_user(handler.handle_error(ValueError("warm-up"), context))
+
+
+@pytest.fixture
+def isolated_cwd(tmp_path, monkeypatch):
+    """Run in a private directory, for handlers created with the default relative log path"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.mark.usefixtures("isolated_cwd")
 class TestErrorHandlerBasics:
     """Test basic error handler functionality"""
     
@@ -27,187 +110,100 @@ class TestErrorHandlerBasics:
         """Test error handler with custom log path"""
         handler = ErrorHandler(log_path="custom/logs")
         assert handler.log_path == "custom/logs"
+    
+    @pytest.mark.slow
+    def test_import_does_not_load_docker(self):
+        """Test the error handler module doesn't import docker by itself"""
+        result = subprocess.run(
+            [sys.executable, "-c",
+             "import sys, src.utils.error_handler; sys.exit('docker' in sys.modules)"],
+            cwd=_REPO_ROOT
+        )
+        assert result.returncode == 0
 
 
 class TestErrorCategorization:
     """Test error categorization"""
     
-    def test_categorize_docker_error(self):
-        """Test Docker errors are categorized correctly"""
-        handler = ErrorHandler()
-        error = DockerException("Docker daemon not running")
-        context = ErrorContext(user_action="test")
-        
+    @pytest.mark.parametrize("error,expected", [
+        (DockerException("Docker daemon not running"), ErrorCategory.DOCKER),
+        (_DB_LOCKED_ERROR, ErrorCategory.DATABASE),
+        (yaml.YAMLError("invalid yaml syntax"), ErrorCategory.SCENARIO),
+        (_FILE_NOT_FOUND_ERROR, ErrorCategory.SYSTEM),
+    ], ids=["docker", "database", "yaml", "file_not_found"])
+    def test_categorization(self, handler, context, error, expected):
+        """Test errors are categorized by type"""
         response = handler.handle_error(error, context)
-        assert response.category == ErrorCategory.DOCKER
-    
-    def test_categorize_database_error(self):
-        """Test database errors are categorized correctly"""
-        handler = ErrorHandler()
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.category == ErrorCategory.DATABASE
-    
-    def test_categorize_yaml_error(self):
-        """Test YAML errors are categorized correctly"""
-        handler = ErrorHandler()
-        error = yaml.YAMLError("invalid yaml syntax")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.category == ErrorCategory.SCENARIO
-    
-    def test_categorize_file_not_found_error(self):
-        """Test file not found errors are categorized correctly"""
-        handler = ErrorHandler()
-        error = FileNotFoundError("file not found")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.category == ErrorCategory.SYSTEM
+        assert response.category == expected
 
 
 class TestErrorSeverity:
     """Test error severity determination"""
     
-    def test_docker_daemon_not_running_is_critical(self):
-        """Test Docker daemon not running is critical"""
-        handler = ErrorHandler()
-        error = DockerException("Docker daemon is not running")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.severity == ErrorSeverity.CRITICAL
-        assert response.should_exit is True
-    
-    def test_database_locked_is_error(self):
-        """Test database locked is error level"""
-        handler = ErrorHandler()
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.severity == ErrorSeverity.ERROR
-    
-    def test_permission_error_is_critical(self):
-        """Test permission errors are critical"""
-        handler = ErrorHandler()
-        error = PermissionError("permission denied")
-        context = ErrorContext(user_action="test")
-        
+    @pytest.mark.parametrize("error,expected_severity,expected_exit", [
+        (_DOCKER_DOWN_ERROR, ErrorSeverity.CRITICAL, True),
+        (_DB_LOCKED_ERROR, ErrorSeverity.ERROR, False),
+        (PermissionError("permission denied"), ErrorSeverity.CRITICAL, True),
+    ], ids=["docker_not_running", "database_locked", "permission"])
+    def test_severity(self, handler, context, error, expected_severity, expected_exit):
+        """Test severity and exit behaviour for each kind of error"""
         response = handler.handle_error(error, context)
-        assert response.severity == ErrorSeverity.CRITICAL
+        assert response.severity == expected_severity
+        assert response.should_exit is expected_exit
 
 
 class TestUserMessages:
     """Test user-friendly error messages"""
     
-    def test_docker_not_running_message(self):
-        """Test Docker not running message is user-friendly"""
-        handler = ErrorHandler()
-        error = DockerException("Cannot connect to Docker daemon")
-        context = ErrorContext(user_action="test")
-        
+    # Each group is a tuple of alternatives, at least one of which must appear
+    @pytest.mark.parametrize("error,expected_groups", [
+        (DockerException("Cannot connect to Docker daemon"),
+         [("Docker daemon",), ("not running", "not accessible")]),
+        (_IMAGE_NOT_FOUND_ERROR, [("image",), ("not found",)]),
+        (_DB_LOCKED_ERROR, [("locked",)]),
+    ], ids=["docker_not_running", "image_not_found", "database_locked"])
+    def test_user_message(self, handler, context, error, expected_groups):
+        """Test user messages describe the problem"""
         response = handler.handle_error(error, context)
-        assert "Docker daemon" in response.user_message
-        assert "not running" in response.user_message or "not accessible" in response.user_message
-    
-    def test_image_not_found_message(self):
-        """Test image not found message is user-friendly"""
-        handler = ErrorHandler()
-        error = ImageNotFound("Image not found")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert "image" in response.user_message.lower()
-        assert "not found" in response.user_message.lower()
-    
-    def test_database_locked_message(self):
-        """Test database locked message is user-friendly"""
-        handler = ErrorHandler()
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert "locked" in response.user_message.lower()
+        for alternatives in expected_groups:
+            assert any(text in response.user_message for text in alternatives), alternatives
 
 
 class TestRecoverySuggestions:
     """Test recovery suggestions"""
     
-    def test_docker_not_running_suggestions(self):
-        """Test Docker not running provides recovery suggestions"""
-        handler = ErrorHandler()
-        error = DockerException("Docker daemon is not running")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert len(response.recovery_suggestions) > 0
-        assert any("install" in s.lower() or "start" in s.lower() 
-                  for s in response.recovery_suggestions)
-    
-    def test_image_not_found_suggestions(self):
-        """Test image not found provides recovery suggestions"""
-        handler = ErrorHandler()
-        error = ImageNotFound("Image not found")
-        context = ErrorContext(user_action="test")
-        
+    @pytest.mark.parametrize("error,keywords", [
+        (_DOCKER_DOWN_ERROR, ("install", "start")),
+        (_IMAGE_NOT_FOUND_ERROR, ("build", "pull")),
+        (_DB_LOCKED_ERROR, ("wait", "retry")),
+    ], ids=["docker_not_running", "image_not_found", "database_locked"])
+    def test_recovery_suggestions(self, handler, context, error, keywords):
+        """Test errors come with a relevant recovery suggestion"""
         response = handler.handle_error(error, context)
         assert len(response.recovery_suggestions) > 0
-        assert any("build" in s.lower() or "pull" in s.lower() 
-                  for s in response.recovery_suggestions)
-    
-    def test_database_locked_suggestions(self):
-        """Test database locked provides recovery suggestions"""
-        handler = ErrorHandler()
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert len(response.recovery_suggestions) > 0
-        assert any("wait" in s.lower() or "retry" in s.lower() 
-                  for s in response.recovery_suggestions)
+        assert any(keyword in s.lower()
+                   for s in response.recovery_suggestions for keyword in keywords)
 
 
 class TestRetryLogic:
     """Test retry logic"""
     
-    def test_database_locked_should_retry(self):
-        """Test database locked errors should retry"""
-        handler = ErrorHandler()
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
+    @pytest.mark.parametrize("error,expected", [
+        (_DB_LOCKED_ERROR, True),
+        (_FILE_NOT_FOUND_ERROR, False),
+        (APIError("timeout waiting for container"), True),
+    ], ids=["database_locked", "file_not_found", "docker_timeout"])
+    def test_should_retry(self, handler, context, error, expected):
+        """Test only transient errors are retried"""
         response = handler.handle_error(error, context)
-        assert response.should_retry is True
-    
-    def test_file_not_found_should_not_retry(self):
-        """Test file not found errors should not retry"""
-        handler = ErrorHandler()
-        error = FileNotFoundError("file not found")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.should_retry is False
-    
-    def test_docker_timeout_should_retry(self):
-        """Test Docker timeout errors should retry"""
-        handler = ErrorHandler()
-        error = APIError("timeout waiting for container")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        assert response.should_retry is True
+        assert response.should_retry is expected
 
 
 class TestContextHandling:
     """Test error context handling"""
     
-    def test_context_with_scenario_id(self):
+    def test_context_with_scenario_id(self, handler):
         """Test error context includes scenario ID"""
-        handler = ErrorHandler()
         error = ValueError("test error")
         context = ErrorContext(
             scenario_id="test_scenario_01",
@@ -217,9 +213,8 @@ class TestContextHandling:
         response = handler.handle_error(error, context)
         assert response.context.scenario_id == "test_scenario_01"
     
-    def test_context_with_container_id(self):
+    def test_context_with_container_id(self, handler):
         """Test error context includes container ID"""
-        handler = ErrorHandler()
         error = ValueError("test error")
         context = ErrorContext(
             container_id="abc123",
@@ -229,9 +224,8 @@ class TestContextHandling:
         response = handler.handle_error(error, context)
         assert response.context.container_id == "abc123"
     
-    def test_context_with_additional_info(self):
+    def test_context_with_additional_info(self, handler):
         """Test error context includes additional info"""
-        handler = ErrorHandler()
         error = ValueError("test error")
         context = ErrorContext(
             user_action="test",
@@ -240,32 +234,33 @@ class TestContextHandling:
         
         response = handler.handle_error(error, context)
         assert response.context.additional_info == {'key': 'value'}
+    
+    def test_context_is_immutable(self, context):
+        """Test a shared error context can't be modified"""
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            context.scenario_id = "changed"
 
 
+@pytest.mark.usefixtures("isolated_cwd")
 class TestConvenienceFunctions:
     """Test convenience functions"""
     
-    def test_handle_docker_error_function(self):
+    def test_handle_docker_error_function(self, context):
         """Test handle_docker_error convenience function"""
         error = DockerException("test error")
-        context = ErrorContext(user_action="test")
         
         response = handle_docker_error(error, context)
         assert response.category == ErrorCategory.DOCKER
     
-    def test_handle_database_error_function(self):
+    def test_handle_database_error_function(self, context):
         """Test handle_database_error convenience function"""
-        error = sqlite3.OperationalError("database is locked")
-        context = ErrorContext(user_action="test")
-        
-        should_retry, response = handle_database_error(error, context)
+        should_retry, response = handle_database_error(_DB_LOCKED_ERROR, context)
         assert response.category == ErrorCategory.DATABASE
         assert should_retry is True
     
-    def test_handle_validation_error_function(self):
+    def test_handle_validation_error_function(self, context):
         """Test handle_validation_error convenience function"""
         error = ValueError("validation failed")
-        context = ErrorContext(user_action="test")
         
         response = handle_validation_error(error, context)
         assert response is not None
@@ -274,11 +269,9 @@ class TestConvenienceFunctions:
 class TestErrorFormatting:
     """Test error message formatting"""
     
-    def test_format_error_for_user(self):
+    def test_format_error_for_user(self, handler, context):
         """Test error formatting for user display"""
-        handler = ErrorHandler()
         error = ValueError("test error")
-        context = ErrorContext(user_action="test")
         
         response = handler.handle_error(error, context)
         formatted = handler.format_error_for_user(response)
@@ -287,36 +280,24 @@ class TestErrorFormatting:
         assert "=" in formatted  # Should have separator lines
         assert len(formatted) > 0
     
-    def test_format_includes_suggestions(self):
-        """Test formatted error includes suggestions"""
-        handler = ErrorHandler()
-        error = DockerException("Docker daemon is not running")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        formatted = handler.format_error_for_user(response)
+    def test_format_critical_error(self, docker_not_running_response, docker_not_running_formatted):
+        """Test formatted critical error has a header, suggestions and an exit warning"""
+        formatted = docker_not_running_formatted
         
+        assert "ERROR" in formatted
+        assert "=" in formatted  # Should have separator lines
         assert "RECOVERY SUGGESTIONS" in formatted or "SUGGESTIONS" in formatted.upper()
-    
-    def test_format_includes_exit_warning(self):
-        """Test formatted error includes exit warning for critical errors"""
-        handler = ErrorHandler()
-        error = DockerException("Docker daemon is not running")
-        context = ErrorContext(user_action="test")
-        
-        response = handler.handle_error(error, context)
-        formatted = handler.format_error_for_user(response)
-        
-        if response.should_exit:
+        if docker_not_running_response.should_exit:
             assert "critical" in formatted.lower() or "exit" in formatted.lower()
 
 
+@pytest.mark.slow
 class TestSystemState:
     """Test system state collection"""
     
-    def test_get_system_state(self):
+    def test_get_system_state(self, worker_log_dir):
         """Test system state collection"""
-        handler = ErrorHandler()
+        handler = ErrorHandler(log_path=str(worker_log_dir))
         state = handler._get_system_state()
         
         assert 'python_version' in state